@@ -16,6 +16,7 @@ class NetBoxCsafConfig(PluginConfig):
     def ready(self):
         """ Initializes the Plugin."""
         post_migrate.connect(init_custom_links)
+        from . import signals
 
         return super().ready()
 
@@ -0,0 +1,122 @@
+"""
+    Incremental reading of large JSON documents.
+
+    Only the value that is currently parsed is kept in memory, so large arrays (e.g. the
+    vulnerabilities of a CSAF document) can be processed entry by entry.
+"""
+import codecs
+import json
+
+WHITESPACE = ' \t\n\r'
+# Characters that may continue a number, a number followed by one of them might be split by a chunk boundary.
+NUMBER_CONTINUATION = '0123456789.eE+-'
+
+
+class JsonStreamReader:
+    """
+    Reads a JSON object from a binary file object member by member.
+
+    members() yields (key, value) pairs of the top level object. Members named in
+    `streamedArrays` whose value is an array are yielded as a generator over the array
+    entries instead of a list. Such a generator must be consumed before the next member is
+    requested, entries that were not consumed are skipped.
+    """
+    def __init__(self, fp, streamedArrays=(), chunkSize=65536):
+        self.fp = fp
+        self.streamedArrays = set(streamedArrays)
+        self.chunkSize = chunkSize
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.jsonDecoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def members(self):
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Expected a member name")
+            self._expect(':')
+            if key in self.streamedArrays and self._peek() == '[':
+                entries = self._arrayEntries()
+                yield key, entries
+                for _ in entries:
+                    pass
+            else:
+                yield key, self._value()
+            if self._next() == '}':
+                return
+
+    def _arrayEntries(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._next() == ']':
+                return
+
+    def _fill(self, minimum=0):
+        """
+        Drop the consumed part of the buffer and read at least `minimum` more characters.
+        """
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        added = 0
+        while not self.eof and added <= minimum:
+            chunk = self.fp.read(self.chunkSize)
+            if not chunk:
+                self.eof = True
+                text = self.decoder.decode(b'', final=True)
+            else:
+                text = self.decoder.decode(chunk)
+            self.buffer += text
+            added += len(text)
+
+    def _peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                raise ValueError("Unexpected end of JSON document")
+            self._fill()
+
+    def _next(self):
+        char = self._peek()
+        if char not in ',}]':
+            raise ValueError(f"Unexpected character {char!r} at offset {self.pos}")
+        self.pos += 1
+        return char
+
+    def _expect(self, expected):
+        char = self._peek()
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} but got {char!r}")
+        self.pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.jsonDecoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer, or ending before a character that could continue it,
+                # might continue in the next chunk: '7.' decodes as 7.
+                incomplete = (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and (end == len(self.buffer) or self.buffer[end] in NUMBER_CONTINUATION)
+                )
+                if self.eof or not incomplete:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow the buffer geometrically so large values are not re-parsed too often.
+            self._fill(len(self.buffer) - self.pos)
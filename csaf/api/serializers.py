@@ -1,6 +1,7 @@
 from netbox.api.serializers import NetBoxModelSerializer
-from ..models import (CsafDocument, CsafMatch, CsafVulnerability, CsafMatchVulnerabilityRemediation)
+from ..models import (CsafDocument, CsafMatch, CsafProduct, CsafVulnerability, CsafMatchVulnerabilityRemediation)
 from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
 from utilities.api import get_serializer_for_model
 
 
@@ -23,6 +24,17 @@ class CsafMatchSerializer(NetBoxModelSerializer):
         fields = ('id', 'device', 'module', 'software', 'csaf_document', 'score', 'time', 'acceptance_status', 'remediation_status', 'description', 'product_name_id')
 
 
+class CsafMatchIngestSerializer(serializers.ModelSerializer):
+    """
+    Validation of the plain fields of matches ingested in bulk. The references and the csafmatch_unique
+    constraint are checked once per batch by ingestMatches(), so this serializer runs no queries.
+    """
+    class Meta:
+        model = CsafMatch
+        fields = ('score', 'time', 'acceptance_status', 'description')
+        validators = []
+
+
 class CsafVulnerabilitySerializer(NetBoxModelSerializer):
     """
     REST API Model Serializer for CsafVulnerability.
@@ -32,6 +44,16 @@ class CsafVulnerabilitySerializer(NetBoxModelSerializer):
         fields = ('id', 'csaf_document', 'ordinal', 'vulnerability_id', 'cve', 'title', 'summary', 'cwe', 'cvss_base_score', 'product_ids')
 
 
+class CsafProductSerializer(NetBoxModelSerializer):
+    """
+    REST API Model Serializer for CsafProduct.
+    """
+    brief_fields = ('id', 'display', 'product_id', 'name')
+    class Meta:
+        model = CsafProduct
+        fields = ('id', 'display', 'csaf_document', 'product_id', 'name', 'vendor', 'product_name', 'version', 'cpe', 'purl')
+
+
 class CsafMatchVulnerabilityRemediationSerializer(NetBoxModelSerializer):
     """
     REST API Model Serializer for CsafMatchVulnerabilityRemediation.
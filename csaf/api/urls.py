@@ -8,5 +8,6 @@ router.register('csafdocument-list', views.CsafDocumentViewSet)
 router.register('csafdocforurl', views.CsafDocumentForUrlView, basename = "docforurl")
 router.register('csafmatch-list', views.CsafMatchViewSet)
 router.register('csafvulnerability-list', views.CsafVulnerabilityViewSet)
+router.register('csafproduct-list', views.CsafProductViewSet)
 
 urlpatterns = router.urls
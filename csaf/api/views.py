@@ -2,16 +2,31 @@
     These classes are needed for bulk update and delete operations.
 """
 from .. import filtersets, models
-from .serializers import CsafDocumentSerializer, CsafMatchSerializer, CsafVulnerabilitySerializer
-from core.choices import JobIntervalChoices
+from .jsonstream import JsonStreamReader
+from ..products import PRODUCT_ROW_FIELDS, build_product_index, get_product_row
+from .serializers import (CsafDocumentSerializer, CsafMatchIngestSerializer, CsafMatchSerializer, CsafProductSerializer,
+                          CsafVulnerabilitySerializer)
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from core.choices import JobIntervalChoices, ObjectChangeActionChoices
+from core.models import ObjectChange
 from datetime import timedelta
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.utils import timezone
+import base64
+import hashlib
+import json
 import requests
+import requests.adapters
 from rq.utils import now
-from netbox.api.viewsets import NetBoxModelViewSet
+import tempfile
+import threading
+import time
+import uuid
+from types import GeneratorType
+from urllib.parse import urlsplit
+from netbox.api.viewsets import NetBoxModelViewSet, NetBoxReadOnlyModelViewSet
 from netbox.jobs import JobRunner, system_job
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
@@ -20,13 +35,15 @@ from rest_framework.response import Response
 TITLE_LOADING = "Loading..."
 TITLE_FAILED = "Loading Failed."
 TITLE_NOT_FOUND = "No Document Found"
+DOCUMENT_CHUNK_SIZE = 64 * 1024
+DOCUMENT_SPOOL_SIZE = 1024 * 1024
 
 
 class CsafDocumentViewSet(NetBoxModelViewSet):
     """
     ViewSet for CsafDocument.
     """
-    queryset = models.CsafDocument.objects.all()
+    queryset = models.CsafDocument.objects.defer(*models.DOCUMENT_CONTENT_FIELDS)
     serializer_class = CsafDocumentSerializer
     filterset_class = filtersets.CsafDocumentFilterSet
 
@@ -86,6 +103,36 @@ def createDocumentForData(data):
     return entity.id
 
 
+def resolveDocumentsForUrls(docurls):
+    """
+    Batch variant of createDocumentForData() for plain docurls.
+    All docurls are resolved with one query, missing documents are created with one bulk insert
+    and a single sync job is scheduled for them.
+    Returns a dict mapping each docurl to the id of its document.
+    """
+    docurls = set(docurls)
+    if not docurls:
+        return {}
+    maxLength = models.CsafDocument._meta.get_field('docurl').max_length
+    for docurl in docurls:
+        if not docurl or len(docurl) > maxLength:
+            raise ValidationError({'csaf_document': f"Invalid docurl: {docurl}"})
+
+    result = dict(models.CsafDocument.objects.filter(docurl__in=docurls).values_list('docurl', 'id'))
+    missing = docurls - result.keys()
+    if missing:
+        print(f"New documents: {len(missing)}")
+        # ignore_conflicts covers the race where someone else just created one of the documents
+        models.CsafDocument.objects.bulk_create(
+            [models.CsafDocument(docurl=docurl, title=TITLE_LOADING) for docurl in missing],
+            batch_size=models.BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        result.update(models.CsafDocument.objects.filter(docurl__in=missing).values_list('docurl', 'id'))
+        CsafDocSyncJob.enqueue(schedule_at = now() + timedelta(seconds=10))
+    return result
+
+
 def truncate(length, data):
     if data is None:
         return data
@@ -100,59 +147,218 @@ def fetchLoadingDocuments():
         Q(title=TITLE_LOADING) |
         (Q(title=TITLE_FAILED) & (Q(next_retry_at__isnull=True) | Q(next_retry_at__lte=now_ts)))
     )
-    token = False
-    verify_ssl = getDocumentVerifySsl()
+    docs = list(query)
+    if not docs:
+        return
+    if not getToken():
+        print("No token, not fetching documents")
+        return
+
+    workers = getDocumentFetchWorkers()
+    timeout = getDocumentFetchTimeout()
     retry_interval = getDocumentRetryInterval()
-    for doc in query:
-        docurl = doc.docurl
-        if not token:
+    session = createDocumentSession(workers, getDocumentVerifySsl())
+    limiter = HostRateLimiter(getDocumentFetchRateLimit())
+
+    def fetch(doc):
+        # The token is taken from the cache for each request, as it may expire while the documents are fetched.
+        # A rejected token is dropped and the request is repeated once with a new one.
+        for attempt in range(2):
             token = getToken()
-        headers = {
-            'authorization': 'Bearer ' + token
-        }
-        try:
-            print(f"Requesting: {docurl}")
-            result = requests.get(
-                url=docurl,
-                headers=headers,
-                verify=verify_ssl,
-            )
-            jsonDoc = result.json()
-            code = getFromJson(jsonDoc, ('code',), 200)
-            if code == 404:
-                doc.title = TITLE_NOT_FOUND
-                doc.tracking_id = None
-                doc.product_tree = None
-                doc.next_retry_at = None
-                models.CsafVulnerability.objects.filter(csaf_document=doc).delete()
-            else:
-                doc.lang = truncate(20, getFromJson(jsonDoc, ('document','lang'), None))
-                doc.title = truncate(1000, getFromJson(jsonDoc, ('document','title'), 'No Title'))
-                doc.tracking_id = truncate(255, getFromJson(jsonDoc, ('document', 'tracking', 'id'), None))
-                doc.version = truncate(50, getFromJson(jsonDoc, ('document','tracking', 'version'), None))
-                doc.publisher = truncate(100, getFromJson(jsonDoc, ('document','publisher', 'name'), None))
-                product_tree = getFromJson(jsonDoc, ('product_tree',), None)
-                if product_tree is None:
-                    product_tree = getFromJson(jsonDoc, ('document', 'product_tree'), None)
-                doc.product_tree = product_tree
-                doc.next_retry_at = None
-                syncVulnerabilitiesForDocument(doc, jsonDoc)
-            print(f"Loaded: {doc.title}")
-            doc.save()
-        except requests.exceptions.RequestException as ex:
-            print("Failed to fetch document")
-            print(ex)
-            markDocumentForRetry(doc, retry_interval)
-        except Exception as e:
-            print(e)
-            markDocumentForRetry(doc, retry_interval)
+            if not token:
+                raise requests.exceptions.RequestException("No token")
+            headers = {
+                'authorization': 'Bearer ' + token
+            }
+            limiter.wait(doc.docurl)
+            print(f"Requesting: {doc.docurl}")
+            with session.get(url=doc.docurl, headers=headers, timeout=timeout, stream=True) as response:
+                if response.status_code == 401:
+                    invalidateToken(token)
+                    if attempt == 0:
+                        continue
+                    response.raise_for_status()
+                return spoolResponseBody(response)
+
+    # Downloads run on the worker pool, parsing and database writes stay in this thread.
+    with session:
+        for doc, result, error in fetchConcurrently(docs, fetch, workers):
+            try:
+                if error is not None:
+                    raise error
+                body, digest = result
+                with body:
+                    loadDocumentFromResponse(doc, body, digest)
+            except requests.exceptions.RequestException as ex:
+                # The stored content and digests stay, so an unchanged document is not synced again on retry.
+                print("Failed to fetch document")
+                print(ex)
+                markDocumentForRetry(doc, retry_interval)
+            except Exception as e:
+                print(e)
+                clearDocumentContent(doc)
+                markDocumentForRetry(doc, retry_interval)
+
+
+def spoolResponseBody(response):
+    """
+    Copy the response body into a temporary file, which is only kept in memory while it is small.
+    Returns the file and the SHA-256 digest of the body.
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=DOCUMENT_SPOOL_SIZE)
+    digest = hashlib.sha256()
+    try:
+        for chunk in response.iter_content(chunk_size=DOCUMENT_CHUNK_SIZE):
+            body.write(chunk)
+            digest.update(chunk)
+        body.seek(0)
+    except Exception:
+        body.close()
+        raise
+    return body, digest.hexdigest()
+
+
+def readDocument(body, withVulnerabilities=True):
+    """
+    Read the parts of a CSAF document that are stored by the plugin.
+    The vulnerabilities are turned into rows one at a time while the document is parsed,
+    so the full vulnerability list is never held in memory.
+    Returns the remaining top level members and the vulnerability rows.
+    """
+    jsonDoc = {}
+    rows = []
+    reader = JsonStreamReader(body, streamedArrays=('vulnerabilities',), chunkSize=DOCUMENT_CHUNK_SIZE)
+    for key, value in reader.members():
+        if key == 'vulnerabilities':
+            if withVulnerabilities and isinstance(value, GeneratorType):
+                for ordinal, vulnerability in enumerate(value, 1):
+                    rows.append(getVulnerabilityRow(ordinal, vulnerability))
+        elif key in ('code', 'document', 'product_tree'):
+            jsonDoc[key] = value
+    return jsonDoc, rows
+
+
+def getVulnerabilitiesDigest(rows):
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(json.dumps(row, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def loadDocumentFromResponse(doc, body, digest):
+    # The stored vulnerabilities are only trusted when the last load completed, see clearDocumentContent().
+    unchanged = digest == doc.content_digest and doc.vulnerabilities_digest is not None
+    jsonDoc, rows = readDocument(body, withVulnerabilities=not unchanged)
+    code = getFromJson(jsonDoc, ('code',), 200)
+    if code == 404:
+        doc.title = TITLE_NOT_FOUND
+        doc.tracking_id = None
+        doc.next_retry_at = None
+        clearDocumentContent(doc)
+    else:
+        doc.lang = truncate(20, getFromJson(jsonDoc, ('document','lang'), None))
+        doc.title = truncate(1000, getFromJson(jsonDoc, ('document','title'), 'No Title'))
+        doc.tracking_id = truncate(255, getFromJson(jsonDoc, ('document', 'tracking', 'id'), None))
+        doc.version = truncate(50, getFromJson(jsonDoc, ('document','tracking', 'version'), None))
+        doc.publisher = truncate(100, getFromJson(jsonDoc, ('document','publisher', 'name'), None))
+        product_tree = getFromJson(jsonDoc, ('product_tree',), None)
+        if product_tree is None:
+            product_tree = getFromJson(jsonDoc, ('document', 'product_tree'), None)
+        doc.product_tree = product_tree
+        if not unchanged or doc.product_index is None:
+            doc.product_index = build_product_index(product_tree)
+            syncProductsForDocument(doc)
+        doc.next_retry_at = None
+        if unchanged:
+            print(f"Unchanged: {doc.docurl}")
+        else:
+            vulnerabilities_digest = getVulnerabilitiesDigest(rows)
+            if vulnerabilities_digest != doc.vulnerabilities_digest:
+                syncVulnerabilitiesForDocument(doc, rows)
+            doc.content_digest = digest
+            doc.vulnerabilities_digest = vulnerabilities_digest
+    print(f"Loaded: {doc.title}")
+    doc.save()
+
+
+def clearDocumentContent(doc):
+    """
+    Remove the product tree and the vulnerabilities of a document, together with the digests describing them.
+    """
+    doc.product_tree = None
+    doc.product_index = None
+    doc.content_digest = None
+    doc.vulnerabilities_digest = None
+    models.CsafVulnerability.objects.filter(csaf_document=doc).delete()
+    models.CsafProduct.objects.filter(csaf_document=doc).delete()
+    models.CsafMatch.objects.filter(csaf_document=doc).update_remediation_from_vulnerabilities()
+
+
+def createDocumentSession(workers, verify_ssl):
+    """
+    Create an HTTP session whose connection pool is large enough for all fetch workers.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.verify = verify_ssl
+    return session
+
+
+class HostRateLimiter:
+    """
+    Spaces out the requests to each host, so that at most `rate` requests per second are started per host.
+    A rate of 0 disables the limit.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.nextSlot = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:
+            current = time.monotonic()
+            slot = max(current, self.nextSlot.get(host, current))
+            self.nextSlot[host] = slot + self.interval
+        if slot > current:
+            time.sleep(slot - current)
+
+
+def fetchConcurrently(items, fetch, workers):
+    """
+    Run fetch(item) for all items on a pool of workers and yield (item, result, error) as they complete.
+    At most two fetches per worker are queued at any time, so completed results do not pile up in memory
+    while the caller processes them.
+    """
+    items = iter(items)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def submitNext():
+            item = next(items, None)
+            if item is not None:
+                pending[executor.submit(fetch, item)] = item
+
+        for _ in range(workers * 2):
+            submitNext()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                submitNext()
+                try:
+                    yield item, future.result(), None
+                except Exception as ex:
+                    yield item, None, ex
 
 
 def markDocumentForRetry(doc, retry_interval):
     doc.title = TITLE_FAILED
-    doc.product_tree = None
     doc.next_retry_at = timezone.now() + timedelta(minutes=retry_interval)
-    models.CsafVulnerability.objects.filter(csaf_document=doc).delete()
 
     try:
         version_int = int(str(doc.version))
@@ -235,37 +441,125 @@ def getProductIds(vulnerability):
     return sorted(product_ids)
 
 
-def syncVulnerabilitiesForDocument(doc, jsonDoc):
-    vulnerabilities = getFromJson(jsonDoc, ('vulnerabilities',), [])
-    if not isinstance(vulnerabilities, list):
-        vulnerabilities = []
-
-    kept_ordinals = []
-    for index, vulnerability in enumerate(vulnerabilities):
-        ordinal = index + 1
-        vulnerability_id = getFromJson(vulnerability, ('cve',), None)
-        vulnerability_id = vulnerability_id or getFromJson(vulnerability, ('id',), None)
-        vulnerability_id = vulnerability_id or f'vuln-{ordinal}'
-
-        data = {
-            'vulnerability_id': truncate(255, str(vulnerability_id)),
-            'cve': truncate(100, getFromJson(vulnerability, ('cve',), None)),
-            'title': truncate(1000, getFromJson(vulnerability, ('title',), None)),
-            'summary': getSummary(vulnerability),
-            'cwe': truncate(255, getFromJson(vulnerability, ('cwe', 'id'), None)),
-            'cvss_base_score': getBaseScore(vulnerability),
-            'product_ids': getProductIds(vulnerability),
+def getVulnerabilityRow(ordinal, vulnerability):
+    """
+    Extract the stored fields of a single CSAF vulnerability entry.
+    """
+    vulnerability_id = getFromJson(vulnerability, ('cve',), None)
+    vulnerability_id = vulnerability_id or getFromJson(vulnerability, ('id',), None)
+    vulnerability_id = vulnerability_id or f'vuln-{ordinal}'
+
+    return {
+        'ordinal': ordinal,
+        'vulnerability_id': truncate(255, str(vulnerability_id)),
+        'cve': truncate(100, getFromJson(vulnerability, ('cve',), None)),
+        'title': truncate(1000, getFromJson(vulnerability, ('title',), None)),
+        'summary': getSummary(vulnerability),
+        'cwe': truncate(255, getFromJson(vulnerability, ('cwe', 'id'), None)),
+        'cvss_base_score': getBaseScore(vulnerability),
+        'product_ids': getProductIds(vulnerability),
+    }
+
+
+VULNERABILITY_FIELDS = ['vulnerability_id', 'cve', 'title', 'summary', 'cwe', 'cvss_base_score', 'product_ids']
+
+
+def syncVulnerabilitiesForDocument(doc, rows):
+    """
+    Bring the stored vulnerabilities of a document in line with the parsed rows.
+    The rows are diffed against the stored ordinals and applied with bulk operations,
+    afterwards the product links of new or changed vulnerabilities and the remediation entries
+    of all matches of the document are rebuilt at once.
+    """
+    rows = {row['ordinal']: row for row in rows}
+    existing = {
+        vulnerability.ordinal: vulnerability
+        for vulnerability in models.CsafVulnerability.objects.filter(csaf_document=doc).only('id', 'ordinal', *VULNERABILITY_FIELDS)
+    }
+    timestamp = timezone.now()
+
+    created = []
+    updated = []
+    relinked = []
+    for ordinal, row in rows.items():
+        vulnerability = existing.get(ordinal)
+        if vulnerability is None:
+            created.append(models.CsafVulnerability(csaf_document=doc, **row))
+            continue
+        changed = False
+        if vulnerability.product_ids != row['product_ids']:
+            relinked.append(vulnerability)
+        for field in VULNERABILITY_FIELDS:
+            if getattr(vulnerability, field) != row[field]:
+                setattr(vulnerability, field, row[field])
+                changed = True
+        if changed:
+            vulnerability.last_updated = timestamp
+            updated.append(vulnerability)
+    stale_ids = [vulnerability.pk for ordinal, vulnerability in existing.items() if ordinal not in rows]
+
+    with transaction.atomic():
+        if stale_ids:
+            models.CsafVulnerability.objects.filter(pk__in=stale_ids).delete()
+        if created:
+            models.CsafVulnerability.objects.bulk_create(created, batch_size=models.BULK_BATCH_SIZE)
+        if updated:
+            models.CsafVulnerability.objects.bulk_update(
+                updated,
+                VULNERABILITY_FIELDS + ['last_updated'],
+                batch_size=models.BULK_BATCH_SIZE,
+            )
+        models.CsafVulnerabilityProduct.objects.rebuild_for(created + relinked)
+        models.CsafMatch.objects.filter(csaf_document=doc).sync_vulnerability_remediations()
+
+
+def syncProductsForDocument(doc):
+    """
+    Bring the stored products of a document in line with its product index, diffed by product id.
+    """
+    rows = {}
+    for product_id, entry in (doc.product_index or {}).items():
+        if entry['product'] is None:
+            continue
+        row = get_product_row(entry['product'])
+        rows[product_id] = {
+            field: truncate(models.CsafProduct._meta.get_field(field).max_length, row[field])
+            for field in PRODUCT_ROW_FIELDS
         }
-        models.CsafVulnerability.objects.update_or_create(
-            csaf_document=doc,
-            ordinal=ordinal,
-            defaults=data,
-        )
-        kept_ordinals.append(ordinal)
+    existing = {
+        product.product_id: product
+        for product in models.CsafProduct.objects.filter(csaf_document=doc).only('id', 'product_id', *PRODUCT_ROW_FIELDS)
+    }
+    timestamp = timezone.now()
 
-    models.CsafVulnerability.objects.filter(csaf_document=doc).exclude(ordinal__in=kept_ordinals).delete()
-    for match in models.CsafMatch.objects.filter(csaf_document=doc):
-        match.sync_vulnerability_remediations()
+    created = []
+    updated = []
+    for product_id, row in rows.items():
+        product = existing.get(product_id)
+        if product is None:
+            created.append(models.CsafProduct(csaf_document=doc, product_id=product_id, **row))
+            continue
+        changed = False
+        for field in PRODUCT_ROW_FIELDS:
+            if getattr(product, field) != row[field]:
+                setattr(product, field, row[field])
+                changed = True
+        if changed:
+            product.last_updated = timestamp
+            updated.append(product)
+    stale_ids = [product.pk for product_id, product in existing.items() if product_id not in rows]
+
+    with transaction.atomic():
+        if stale_ids:
+            models.CsafProduct.objects.filter(pk__in=stale_ids).delete()
+        if created:
+            models.CsafProduct.objects.bulk_create(created, batch_size=models.BULK_BATCH_SIZE)
+        if updated:
+            models.CsafProduct.objects.bulk_update(
+                updated,
+                PRODUCT_ROW_FIELDS + ['last_updated'],
+                batch_size=models.BULK_BATCH_SIZE,
+            )
 
 
 def getFromJson(document, path, dflt):
@@ -291,18 +585,137 @@ def getDocumentVerifySsl():
 
 
 def getDocumentRetryInterval():
-    interval = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'isduba', 'document_retry_interval_minutes'), None)
-    interval = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'isduba_document_retry_interval_minutes'), interval)
+    return getIsdubaNumber('document_retry_interval_minutes', 60, 1)
+
+
+def getIsdubaNumber(key, dflt, minimum, cast=int):
+    value = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'isduba', key), None)
+    value = getFromJson(settings.PLUGINS_CONFIG, ('csaf', f'isduba_{key}'), value)
     try:
-        interval = int(interval)
+        value = cast(value)
     except (TypeError, ValueError):
-        interval = 60
-    if interval < 1:
-        interval = 1
-    return interval
+        value = dflt
+    if value < minimum:
+        value = minimum
+    return value
 
-def getToken() -> str:
-    """Retrieve an access token via Keycloak."""
+
+def getDocumentFetchWorkers():
+    return getIsdubaNumber('document_fetch_workers', 4, 1)
+
+
+def getDocumentFetchTimeout():
+    return getIsdubaNumber('document_fetch_timeout_seconds', 60, 1, float)
+
+
+def getDocumentFetchRateLimit():
+    return getIsdubaNumber('document_fetch_rate_limit', 10, 0, float)
+
+
+class TokenCache:
+    """
+    Process-wide cache for OAuth access tokens, keyed by the login they belong to.
+    Tokens are refreshed shortly before they expire, using the refresh token when one is available.
+    Concurrent callers that find no valid token wait for a single login instead of each logging in.
+    """
+    def __init__(self, margin=30, fallbackTtl=300):
+        self.margin = margin
+        self.fallbackTtl = fallbackTtl
+        self.lock = threading.Lock()
+        self.keyLocks = {}
+        self.entries = {}
+
+    def get(self, key, login, refresh=None):
+        """
+        Return a valid access token for key. login() and refresh(refresh_token) perform the actual token
+        requests and return the token response as dict, or None on failure.
+        """
+        token = self._validToken(key)
+        if token:
+            return token
+        with self._keyLock(key):
+            # Another thread might have logged in while we were waiting.
+            token = self._validToken(key)
+            if token:
+                return token
+            entry = self.entries.get(key)
+            payload = None
+            if refresh and entry and entry['refresh_token'] and entry['refresh_expires_at'] > time.monotonic():
+                payload = refresh(entry['refresh_token'])
+            if not payload or not payload.get('access_token'):
+                payload = login()
+            if not payload or not payload.get('access_token'):
+                self.entries.pop(key, None)
+                return None
+            self.entries[key] = self._entryFor(payload)
+            return payload['access_token']
+
+    def invalidate(self, key, token=None):
+        """
+        Drop the cached token for key, e.g. after it was rejected with a 401.
+        If token is given, the entry is only dropped if it still holds that token.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and (token is None or entry['access_token'] == token):
+                del self.entries[key]
+
+    def _keyLock(self, key):
+        with self.lock:
+            return self.keyLocks.setdefault(key, threading.Lock())
+
+    def _validToken(self, key):
+        entry = self.entries.get(key)
+        if entry and entry['expires_at'] > time.monotonic():
+            return entry['access_token']
+        return None
+
+    def _expiresIn(self, payload):
+        """
+        Lifetime of the access token in seconds, taken from expires_in, the exp claim of a JWT
+        or the fallback TTL, in that order.
+        """
+        expiresIn = getExpiresIn(payload, 'expires_in')
+        if not expiresIn:
+            exp = getJwtClaims(payload['access_token']).get('exp')
+            if isinstance(exp, (int, float)):
+                expiresIn = max(exp - time.time(), 0)
+        if not expiresIn:
+            expiresIn = self.fallbackTtl
+        return expiresIn
+
+    def _entryFor(self, payload):
+        current = time.monotonic()
+        return {
+            'access_token': payload['access_token'],
+            'expires_at': current + self._expiresIn(payload) - self.margin,
+            'refresh_token': payload.get('refresh_token'),
+            'refresh_expires_at': current + getExpiresIn(payload, 'refresh_expires_in') - self.margin,
+        }
+
+
+def getExpiresIn(payload, key):
+    try:
+        return max(int(payload.get(key)), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def getJwtClaims(token):
+    """Decode the (unverified) claims of a JWT, returns an empty dict for other tokens."""
+    try:
+        claims = token.split('.')[1]
+        claims = base64.urlsafe_b64decode(claims + '=' * (-len(claims) % 4))
+        claims = json.loads(claims)
+    except (AttributeError, IndexError, ValueError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+tokenCache = TokenCache()
+
+
+def getKeycloakConfig():
     keycloakUrl = getFromJson(settings.PLUGINS_CONFIG, ('csaf','isduba','keycloak_url'), None)
     keycloakUrl = getFromJson(settings.PLUGINS_CONFIG, ('csaf','isduba_keycloak_url'), keycloakUrl)
     verifySsl = getFromJson(settings.PLUGINS_CONFIG, ('csaf','isduba','keycloak_verify_ssl'), True)
@@ -311,27 +724,54 @@ def getToken() -> str:
     username = getFromJson(settings.PLUGINS_CONFIG, ('csaf','isduba_username'), username)
     password = getFromJson(settings.PLUGINS_CONFIG, ('csaf','isduba','password'), None)
     password = getFromJson(settings.PLUGINS_CONFIG, ('csaf','isduba_password'), password)
+    return keycloakUrl, verifySsl, username, password
 
+
+def requestKeycloakToken(keycloakUrl, verifySsl, data):
     token_url = f"{keycloakUrl}/realms/isduba/protocol/openid-connect/token"
     try:
         print(f"Requesting: {token_url}")
         response = requests.post(
             token_url,
-            data={
-                "grant_type": "password",
-                "client_id": "auth",
-                "username": username,
-                "password": password,
-            },
+            data={"client_id": "auth", **data},
             verify=verifySsl,
+            timeout=30,
         )
         if (response.status_code < 200 or response.status_code >= 300):
             print(f"Failed to login: {response.content}")
-        return response.json().get("access_token")
-    except requests.exceptions.RequestException as ex:
+            return None
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as ex:
         print("Failed to login to ISDuBA")
         print(ex)
 
+
+def getToken() -> str:
+    """Retrieve an access token via Keycloak, reusing the cached one while it is valid."""
+    keycloakUrl, verifySsl, username, password = getKeycloakConfig()
+
+    def login():
+        return requestKeycloakToken(keycloakUrl, verifySsl, {
+            "grant_type": "password",
+            "username": username,
+            "password": password,
+        })
+
+    def refresh(refresh_token):
+        return requestKeycloakToken(keycloakUrl, verifySsl, {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+        })
+
+    return tokenCache.get(('isduba', keycloakUrl, username), login, refresh)
+
+
+def invalidateToken(token=None):
+    """Forget the cached ISDuBA token, e.g. after it was rejected."""
+    keycloakUrl, _, username, _ = getKeycloakConfig()
+    tokenCache.invalidate(('isduba', keycloakUrl, username), token)
+
+
 @system_job(interval=JobIntervalChoices.INTERVAL_HOURLY)
 class CsafDocSyncJob(JobRunner):
     class Meta:
@@ -353,12 +793,13 @@ class CsafMatchViewSet(NetBoxModelViewSet):
         if isinstance(request.data, list):
             count = len(request.data)
             print(f"Handling {count} matches")
-            result = []
+            documentIds = resolveDocumentsForUrls(
+                data['csaf_document'] for data in request.data if isinstance(data.get('csaf_document'), str)
+            )
             for data in request.data:
                 if isinstance(data.get('csaf_document'), str):
-                    data['csaf_document'] = createDocumentForData({'docurl':data['csaf_document']})
-                entity = createMatchForData(data)
-                result.append(entity)
+                    data['csaf_document'] = documentIds[data['csaf_document']]
+            result = ingestMatches(request.data, request.user, getattr(request, 'id', None))
         else:
             data = request.data
             if isinstance(data.get('csaf_document'), str):
@@ -377,18 +818,7 @@ def createMatchForData(data):
     try:
         entity = query.get()
         print(f"Duplicate: {device}, {module}, {software}, {csaf_document}, {product_name_id}")
-        score = data.get('score', 0)
-        description = data.get('description', '')
-        if entity.score < score:
-            if entity.description is None:
-                entity.description = ''
-            entity.description += '\n'
-            entity.description += description
-            entity.description += f'\nScore increased from {entity.score} to {score}'
-            entity.score = score
-            if entity.acceptance_status == models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE:
-                entity.acceptance_status = models.CsafMatch.AcceptanceStatus.REOPENED
-                entity.description += f'\nReopened'
+        if mergeDuplicateMatch(entity, data):
             entity.save()
     except models.CsafMatch.DoesNotExist:
         print(f"New: {device}, {module}, {software}, {csaf_document}, {product_name_id}")
@@ -406,6 +836,187 @@ def createMatchForData(data):
     return CsafMatchSerializer(entity).data.get('id')
 
 
+MATCH_KEY_FIELDS = ('device', 'module', 'software', 'csaf_document')
+
+
+def getRelatedId(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, dict):
+        value = value.get('id')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid reference: {value}")
+
+
+def getMatchKey(data):
+    key = tuple(getRelatedId(data.get(field)) for field in MATCH_KEY_FIELDS)
+    if key[3] is None:
+        raise ValidationError({'csaf_document': 'This field is required.'})
+    product_name_id = data.get('product_name_id') or models.CsafMatch._meta.get_field('product_name_id').default
+    return key + (str(product_name_id),)
+
+
+def validateMatchReferences(keys):
+    """
+    Check that all assets and documents referenced by the keys exist, using one query per referenced model.
+    """
+    for index, field in enumerate(MATCH_KEY_FIELDS):
+        ids = {key[index] for key in keys if key[index] is not None}
+        if not ids:
+            continue
+        related_model = models.CsafMatch._meta.get_field(field).related_model
+        found = set(related_model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        missing = ids - found
+        if missing:
+            raise ValidationError({field: f"Unknown {related_model._meta.verbose_name} id(s): {sorted(missing)}"})
+
+
+def getMatchesForKeys(keys):
+    """
+    Return the existing matches for the given keys by key, querying the exact key tuples in batches.
+    """
+    keys = list(set(keys))
+    matches = {}
+    for offset in range(0, len(keys), models.BULK_BATCH_SIZE):
+        condition = Q()
+        for device, module, software, csaf_document, product_name_id in keys[offset:offset + models.BULK_BATCH_SIZE]:
+            condition |= Q(
+                device_id=device,
+                module_id=module,
+                software_id=software,
+                csaf_document_id=csaf_document,
+                product_name_id=product_name_id,
+            )
+        # The tags are part of the snapshot taken before a change, see logMatchChanges().
+        for entity in models.CsafMatch.objects.filter(condition).prefetch_related('tags'):
+            key = (entity.device_id, entity.module_id, entity.software_id, entity.csaf_document_id, entity.product_name_id)
+            matches[key] = entity
+    return matches
+
+
+def logMatchChanges(matches, user, requestId, action=ObjectChangeActionChoices.ACTION_UPDATE):
+    """
+    Record the changes of matches written in bulk, updated matches need a snapshot() taken before the change.
+    bulk_create() skips ObjectChange.save(), so the fields it derives are set here. Changes made by a
+    background job without user are recorded without user name, each call gets its own request id if none is given.
+    """
+    userName = user.username if user is not None else ''
+    requestId = requestId or uuid.uuid4()
+    changes = []
+    for csafMatch in matches:
+        objectChange = csafMatch.to_objectchange(action)
+        objectChange.user = user
+        objectChange.user_name = userName
+        objectChange.object_repr = str(csafMatch)[:200]
+        objectChange.request_id = requestId
+        changes.append(objectChange)
+    ObjectChange.objects.bulk_create(changes, batch_size=models.BULK_BATCH_SIZE)
+
+
+def raisesScore(entity, data):
+    return entity.score < data.get('score', 0)
+
+
+def mergeDuplicateMatch(entity, data):
+    """
+    Apply the data of a re-reported match to an existing entity. Returns True if the entity was changed.
+    """
+    score = data.get('score', 0)
+    description = data.get('description') or ''
+    if not raisesScore(entity, data):
+        return False
+    if entity.description is None:
+        entity.description = ''
+    entity.description += '\n'
+    entity.description += description
+    entity.description += f'\nScore increased from {entity.score} to {score}'
+    entity.score = score
+    if entity.acceptance_status == models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE:
+        entity.acceptance_status = models.CsafMatch.AcceptanceStatus.REOPENED
+        entity.description += f'\nReopened'
+    return True
+
+
+def buildMatchFromData(key, data):
+    """
+    Build a new match for a key and the validated data of CsafMatchIngestSerializer.
+    """
+    device, module, software, csaf_document, product_name_id = key
+    return models.CsafMatch(
+        device_id=device,
+        module_id=module,
+        software_id=software,
+        csaf_document_id=csaf_document,
+        product_name_id=product_name_id,
+        **data,
+    )
+
+
+def ingestMatches(dataList, user=None, requestId=None, retries=1):
+    """
+    Set-based variant of createMatchForData() for a list of matches.
+    The fields are validated with CsafMatchIngestSerializer, the references with one query per referenced
+    model. Existing matches are resolved with one query over the exact csafmatch_unique keys, so only keys
+    without a match are created. New matches are written with bulk_create, changed ones with bulk_update.
+    The changes are recorded for the user, and the remediation rows are synced for the whole batch.
+    Returns the match ids in the order of dataList.
+    """
+    keys = [getMatchKey(data) for data in dataList]
+    validateMatchReferences(keys)
+    serializer = CsafMatchIngestSerializer(data=dataList, many=True)
+    serializer.is_valid(raise_exception=True)
+    entities = getMatchesForKeys(keys)
+
+    created = []
+    updated = {}
+    for key, data in zip(keys, serializer.validated_data):
+        entity = entities.get(key)
+        if entity is None:
+            entity = buildMatchFromData(key, data)
+            entities[key] = entity
+            created.append(entity)
+            continue
+        if entity.pk is not None and entity.pk not in updated and raisesScore(entity, data):
+            entity.snapshot()
+        if mergeDuplicateMatch(entity, data) and entity.pk is not None:
+            updated[entity.pk] = entity
+
+    # Creations and updates of one batch share the request id of their change records.
+    requestId = requestId or uuid.uuid4()
+
+    now_ts = timezone.now()
+    for entity in updated.values():
+        entity.last_updated = now_ts
+    print(f"New: {len(created)}, Updated: {len(updated)}, Unchanged: {len(dataList) - len(created) - len(updated)}")
+    try:
+        with transaction.atomic():
+            models.CsafMatch.objects.bulk_create(created, batch_size=models.BULK_BATCH_SIZE)
+            models.CsafMatch.objects.bulk_update(
+                updated.values(),
+                ['score', 'description', 'acceptance_status', 'last_updated'],
+                batch_size=models.BULK_BATCH_SIZE,
+            )
+            logMatchChanges(created, user, requestId, ObjectChangeActionChoices.ACTION_CREATE)
+            logMatchChanges(updated.values(), user, requestId)
+            models.CsafMatch.objects.filter(
+                pk__in={entities[key].pk for key in keys},
+            ).sync_vulnerability_remediations()
+            if created or updated:
+                models.CsafDocument.objects.filter(
+                    pk__in={entity.csaf_document_id for entity in created + list(updated.values())},
+                ).refresh_match_counts()
+    except IntegrityError:
+        if retries <= 0:
+            raise
+        # Race condition, someone else just created some of the matches
+        print("Race: retrying batch")
+        return ingestMatches(dataList, user, requestId, retries - 1)
+
+    return [entities[key].pk for key in keys]
+
+
 class CsafVulnerabilityViewSet(NetBoxModelViewSet):
     """
     ViewSet for CsafVulnerability.
@@ -413,3 +1024,12 @@ class CsafVulnerabilityViewSet(NetBoxModelViewSet):
     queryset = models.CsafVulnerability.objects.all()
     serializer_class = CsafVulnerabilitySerializer
     filterset_class = filtersets.CsafVulnerabilityFilterSet
+
+
+class CsafProductViewSet(NetBoxReadOnlyModelViewSet):
+    """
+    ViewSet for CsafProduct, read only as the products are derived from the product trees.
+    """
+    queryset = models.CsafProduct.objects.all()
+    serializer_class = CsafProductSerializer
+    filterset_class = filtersets.CsafProductFilterSet
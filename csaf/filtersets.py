@@ -6,7 +6,7 @@ from django.db.models import Q
 from netbox.filtersets import NetBoxModelFilterSet
 from utilities.filters import MultiValueCharFilter
 from d3c.models import Software
-from .models import CsafDocument, CsafMatch, CsafVulnerability, CsafMatchVulnerabilityRemediation
+from .models import CsafDocument, CsafMatch, CsafProduct, CsafVulnerability, CsafMatchVulnerabilityRemediation
 
 
 class CsafDocumentFilterSet(NetBoxModelFilterSet):
@@ -50,7 +50,8 @@ class CsafMatchFilterSet(NetBoxModelFilterSet):
     """
     class Meta:
         model = CsafMatch
-        fields = ('id', 'device_id', 'module_id', 'software_id', 'csaf_document_id', 'acceptance_status', 'remediation_status')
+        fields = ('id', 'device_id', 'module_id', 'software_id', 'csaf_document_id', 'acceptance_status', 'remediation_status',
+                  'remediation_total_count', 'remediation_resolved_count', 'remediation_in_progress_count')
 
     device_id = django_filters.ModelMultipleChoiceFilter(
         queryset = Device.objects.all(),
@@ -128,6 +129,15 @@ class CsafVulnerabilityFilterSet(NetBoxModelFilterSet):
     cwe = MultiValueCharFilter(
         lookup_expr='icontains'
     )
+    product_id = MultiValueCharFilter(
+        method='filter_product_id',
+        label='Product ID',
+    )
+
+    def filter_product_id(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.affecting_products(value)
 
     def search(self, queryset, status, value):
         if not value.strip():
@@ -142,6 +152,49 @@ class CsafVulnerabilityFilterSet(NetBoxModelFilterSet):
             Q(csaf_document__tracking_id__icontains=value)
         )
 
+class CsafProductFilterSet(NetBoxModelFilterSet):
+    """
+    Definition of the Filterset for CsafProduct.
+    """
+    class Meta:
+        model = CsafProduct
+        fields = ('id', 'csaf_document_id', 'product_id', 'name', 'vendor', 'product_name', 'version', 'cpe', 'purl')
+
+    csaf_document_id = django_filters.ModelMultipleChoiceFilter(
+        queryset=CsafDocument.objects.all(),
+        label='Documents',
+    )
+
+    # Case-insensitive exact filters served by the Upper() indexes of CsafProduct,
+    # substring matches remain available through the generated __ic lookups.
+    product_id = MultiValueCharFilter()
+    name = MultiValueCharFilter(
+        lookup_expr='iexact'
+    )
+    vendor = MultiValueCharFilter(
+        lookup_expr='iexact'
+    )
+    product_name = MultiValueCharFilter(
+        lookup_expr='iexact'
+    )
+    version = MultiValueCharFilter(
+        lookup_expr='iexact'
+    )
+    cpe = MultiValueCharFilter()
+    purl = MultiValueCharFilter()
+
+    def search(self, queryset, name, value):
+        if not value.strip():
+            return queryset
+        return queryset.filter(
+            Q(product_id__icontains=value) |
+            Q(name__icontains=value) |
+            Q(vendor__icontains=value) |
+            Q(product_name__icontains=value) |
+            Q(cpe__icontains=value) |
+            Q(purl__icontains=value)
+        )
+
 class CsafMatchVulnerabilityRemediationFilterSet(NetBoxModelFilterSet):
     """
     Definition of the Filterset for CsafMatchVulnerabilityRemediation.
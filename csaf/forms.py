@@ -3,7 +3,7 @@
 """
 
 import datetime
-from .models import CsafDocument, CsafMatch, CsafVulnerability, CsafMatchVulnerabilityRemediation
+from .models import CsafDocument, CsafMatch, CsafProduct, CsafVulnerability, CsafMatchVulnerabilityRemediation
 from dcim.models.devices import Device, Module
 from django import forms
 from netbox.forms import NetBoxModelForm, NetBoxModelFilterSetForm, NetBoxModelBulkEditForm
@@ -127,6 +127,25 @@ class CsafVulnerabilityFilterForm(NetBoxModelFilterSetForm):
     cve = forms.CharField(required=False)
     title = forms.CharField(required=False)
     cwe = forms.CharField(required=False)
+    product_id = forms.CharField(required=False, label='Product ID')
+
+
+class CsafProductFilterForm(NetBoxModelFilterSetForm):
+    """
+    Input Form for filtering CsafProduct objects.
+    """
+    model = CsafProduct
+    csaf_document_id = DynamicModelMultipleChoiceField(
+        queryset=CsafDocument.objects.all(),
+        required=False,
+        label='CSAF Document',
+    )
+    product_id = forms.CharField(required=False, label='Product ID')
+    vendor = forms.CharField(required=False)
+    product_name = forms.CharField(required=False)
+    version = forms.CharField(required=False)
+    cpe = forms.CharField(required=False, label='CPE')
+    purl = forms.CharField(required=False, label='PURL')
 
 
 class CsafMatchVulnerabilityRemediationFilterForm(NetBoxModelFilterSetForm):
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0016_csafdocument_next_retry_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csafdocument',
+            name='content_digest',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='csafdocument',
+            name='vulnerabilities_digest',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:30
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_match_counts(apps, schema_editor):
+    CsafDocument = apps.get_model('csaf', 'CsafDocument')
+    CsafMatch = apps.get_model('csaf', 'CsafMatch')
+
+    def count(**filters):
+        return Coalesce(Subquery(
+            CsafMatch.objects
+                .filter(csaf_document=OuterRef('pk'), **filters)
+                .order_by()
+                .values('csaf_document')
+                .annotate(c=Count('*'))
+                .values('c')
+        ), 0)
+
+    CsafDocument.objects.update(
+        new_match_count=count(acceptance_status__in=['N', 'O']),
+        confirmed_match_count=count(acceptance_status='C'),
+        false_positive_match_count=count(acceptance_status='F'),
+        total_match_count=count(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0017_csafdocument_digests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csafdocument',
+            name='new_match_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='csafdocument',
+            name='confirmed_match_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='csafdocument',
+            name='false_positive_match_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='csafdocument',
+            name='total_match_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_match_counts, migrations.RunPython.noop),
+    ]
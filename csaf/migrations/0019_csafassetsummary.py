@@ -0,0 +1,71 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_asset_summaries(apps, schema_editor):
+    CsafAssetSummary = apps.get_model('csaf', 'CsafAssetSummary')
+    CsafMatch = apps.get_model('csaf', 'CsafMatch')
+    CsafMatchVulnerabilityRemediation = apps.get_model('csaf', 'CsafMatchVulnerabilityRemediation')
+
+    for field in ('device', 'module', 'software'):
+        summaries = {}
+        match_counts = CsafMatch.objects.filter(
+            **{f'{field}__isnull': False}
+        ).order_by().values(field).annotate(
+            new_match_count=Count('id', filter=Q(acceptance_status='N')),
+            reopened_match_count=Count('id', filter=Q(acceptance_status='O')),
+            confirmed_match_count=Count('id', filter=Q(acceptance_status='C')),
+            false_positive_match_count=Count('id', filter=Q(acceptance_status='F')),
+        )
+        for row in match_counts:
+            asset_id = row.pop(field)
+            summaries[asset_id] = CsafAssetSummary(**{f'{field}_id': asset_id}, **row)
+        vulnerability_counts = CsafMatchVulnerabilityRemediation.objects.filter(
+            **{f'match__{field}__isnull': False},
+            match__acceptance_status='C',
+        ).order_by().values(f'match__{field}').annotate(
+            open_vulnerability_count=Count('id', filter=Q(remediation_status='1')),
+            in_progress_vulnerability_count=Count('id', filter=Q(remediation_status='2')),
+            resolved_vulnerability_count=Count('id', filter=Q(remediation_status='3')),
+        )
+        for row in vulnerability_counts:
+            summary = summaries[row.pop(f'match__{field}')]
+            for name, value in row.items():
+                setattr(summary, name, value)
+        CsafAssetSummary.objects.bulk_create(summaries.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0018_csafdocument_match_counts'),
+        ('d3c', '0004_alter_filehash_options_alter_hash_options_and_more'),
+        ('dcim', '0207_remove_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CsafAssetSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('new_match_count', models.PositiveIntegerField(default=0)),
+                ('reopened_match_count', models.PositiveIntegerField(default=0)),
+                ('confirmed_match_count', models.PositiveIntegerField(default=0)),
+                ('false_positive_match_count', models.PositiveIntegerField(default=0)),
+                ('open_vulnerability_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_vulnerability_count', models.PositiveIntegerField(default=0)),
+                ('resolved_vulnerability_count', models.PositiveIntegerField(default=0)),
+                ('device', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='csaf_summary', to='dcim.device')),
+                ('module', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='csaf_summary', to='dcim.module')),
+                ('software', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='csaf_summary', to='d3c.software')),
+            ],
+            options={
+                'verbose_name_plural': 'CsafAssetSummaries',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(backfill_asset_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_vulnerability_products(apps, schema_editor):
+    CsafVulnerability = apps.get_model('csaf', 'CsafVulnerability')
+    CsafVulnerabilityProduct = apps.get_model('csaf', 'CsafVulnerabilityProduct')
+
+    rows = CsafVulnerability.objects.values_list('id', 'csaf_document_id', 'product_ids').iterator()
+    CsafVulnerabilityProduct.objects.bulk_create(
+        (
+            CsafVulnerabilityProduct(
+                vulnerability_id=vulnerability_id,
+                csaf_document_id=document_id,
+                product_id=product_id,
+            )
+            for vulnerability_id, document_id, product_ids in rows
+            for product_id in set(product_ids or [])
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0019_csafassetsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CsafVulnerabilityProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('product_id', models.CharField()),
+                ('csaf_document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='csaf.csafdocument')),
+                ('vulnerability', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='csaf.csafvulnerability')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['csaf_document', 'product_id'], name='csafvulnproduct_doc_product')],
+                'constraints': [models.UniqueConstraint(fields=('vulnerability', 'product_id'), name='csafvulnproduct_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_vulnerability_products, migrations.RunPython.noop),
+    ]
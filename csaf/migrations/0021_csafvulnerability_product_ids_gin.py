@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0020_csafvulnerabilityproduct'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='csafvulnerability',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['product_ids'], name='csafvulnerability_product_ids', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0021_csafvulnerability_product_ids_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csafmatch',
+            name='remediations_dirty',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:00
+
+from django.db import migrations, models
+from django.db.models import Case, Count, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import Exact, GreaterThan
+
+
+def backfill_remediation_counts(apps, schema_editor):
+    CsafMatch = apps.get_model('csaf', 'CsafMatch')
+    CsafMatchVulnerabilityRemediation = apps.get_model('csaf', 'CsafMatchVulnerabilityRemediation')
+
+    def count(**filters):
+        return Coalesce(Subquery(
+            CsafMatchVulnerabilityRemediation.objects
+                .filter(match=OuterRef('pk'), **filters)
+                .order_by()
+                .values('match')
+                .annotate(c=Count('*'))
+                .values('c')
+        ), 0)
+
+    total, resolved, in_progress = count(), count(remediation_status='3'), count(remediation_status='2')
+    CsafMatch.objects.update(
+        remediation_total_count=total,
+        remediation_resolved_count=resolved,
+        remediation_in_progress_count=in_progress,
+        remediation_status=Case(
+            When(Exact(total, 0), then=Value('1')),
+            When(Exact(resolved, total), then=Value('3')),
+            When(GreaterThan(resolved + in_progress, 0), then=Value('2')),
+            default=Value('1'),
+            output_field=models.CharField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0022_csafmatch_remediations_dirty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csafmatch',
+            name='remediation_total_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='csafmatch',
+            name='remediation_resolved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='csafmatch',
+            name='remediation_in_progress_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_remediation_counts, migrations.RunPython.noop),
+    ]
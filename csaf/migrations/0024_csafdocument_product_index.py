@@ -0,0 +1,167 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+# Copy of the product index helpers of csaf.products at the time of this migration,
+# so later changes to them do not change what the migration stores.
+def build_product_index(product_tree):
+    """
+    Return the products of a product tree keyed by product id, None if there is no tree.
+    Each entry holds 'product', the entry of extract_csaf_products() with path, lineage and helper fields,
+    and 'info', the product info of gatherProductInfoFromDoc().
+    """
+    if not product_tree:
+        return None
+    info = {
+        str(product_id).strip(): data
+        for product_id, data in gatherProductInfoIndex(product_tree).items()
+    }
+    index = {}
+    for product in extract_csaf_products(product_tree):
+        product_id = str(product.get('product_id', '')).strip()
+        if product_id and product_id not in index:
+            index[product_id] = {'product': product, 'info': info.get(product_id, {})}
+    for product_id, data in info.items():
+        index.setdefault(product_id, {'product': None, 'info': data})
+    return index
+
+
+def extract_csaf_products(product_tree):
+    products = []
+    known_branch_categories = {
+        'architecture',
+        'host_name',
+        'language',
+        'legacy',
+        'patch_level',
+        'product_family',
+        'product_name',
+        'product_version',
+        'product_version_range',
+        'service_pack',
+        'specification',
+        'vendor',
+    }
+
+    def walk(node, path, lineage):
+        if isinstance(node, dict):
+            category = node.get('category')
+            name = node.get('name')
+            include_in_lineage = category in known_branch_categories and isinstance(name, str) and bool(name.strip())
+            current_path = path + ([name] if include_in_lineage else [])
+            current_lineage = lineage + ([{'category': category, 'name': name}] if include_in_lineage else [])
+
+            product = node.get('product')
+            if isinstance(product, dict):
+                entry = dict(product)
+                entry['_branch_category'] = category
+                entry['_branch_name'] = name
+                if current_path:
+                    entry['path'] = current_path
+                if current_lineage:
+                    entry['_lineage'] = current_lineage
+                products.append(entry)
+
+            full_product_names = node.get('full_product_names')
+            if isinstance(full_product_names, list):
+                for item in full_product_names:
+                    if isinstance(item, dict):
+                        entry = dict(item)
+                        entry['_branch_category'] = category
+                        entry['_branch_name'] = name
+                        if current_path:
+                            entry['path'] = current_path
+                        if current_lineage:
+                            entry['_lineage'] = current_lineage
+                        products.append(entry)
+
+            if 'product_id' in node and 'name' in node and category in known_branch_categories:
+                entry = dict(node)
+                entry['_branch_category'] = category
+                entry['_branch_name'] = name
+                if current_path:
+                    entry['path'] = current_path
+                if current_lineage:
+                    entry['_lineage'] = current_lineage
+                products.append(entry)
+
+            for branch in node.get('branches', []) or []:
+                walk(branch, current_path, current_lineage)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, path, lineage)
+
+    walk(product_tree or {}, [], [])
+    return products
+
+
+def gatherProductInfoIndex(product_tree):
+    """
+    Return the product info of all products of a product tree by product id, walking the tree once.
+    The entries equal the results of gatherProductInfoFromDoc().
+    """
+    index = {}
+    for branch in (product_tree or {}).get('branches', []):
+        indexProductInfoFromBranch(branch, [], index)
+    return index
+
+
+def indexProductInfoFromBranch(branch, parents, index):
+    productNameId = getProductId(branch)
+    if productNameId is not None and productNameId not in index:
+        data = {}
+        addDataFromBranch(branch.get('product'), data)
+        addDataFromBranch(branch, data)
+        for parent in reversed(parents):
+            addDataFromBranch(parent, data)
+        index[productNameId] = data
+    parents.append(branch)
+    for sub in branch.get('branches', []):
+        indexProductInfoFromBranch(sub, parents, index)
+    parents.pop()
+
+
+def addDataFromBranch(branch, data):
+    if branch.get('category'):
+        category = branch.get('category', None)
+        if category and not data.get(category):
+            data[category] = branch.get('name')
+    if branch.get('product_id'):
+        data['product_name'] = branch.get('name')
+
+
+def getProductId(branch):
+    product = branch.get('product')
+    return product.get('product_id') if isinstance(product, dict) else None
+
+
+def backfill_product_index(apps, schema_editor):
+    CsafDocument = apps.get_model('csaf', 'CsafDocument')
+
+    documents = CsafDocument.objects.filter(product_tree__isnull=False).only('id', 'product_tree')
+    batch = []
+    for document in documents.iterator(chunk_size=100):
+        document.product_index = build_product_index(document.product_tree)
+        batch.append(document)
+        if len(batch) >= 100:
+            CsafDocument.objects.bulk_update(batch, ['product_index'])
+            batch = []
+    if batch:
+        CsafDocument.objects.bulk_update(batch, ['product_index'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0023_csafmatch_remediation_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csafdocument',
+            name='product_index',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_product_index, migrations.RunPython.noop),
+    ]
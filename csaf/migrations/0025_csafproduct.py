@@ -0,0 +1,105 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:00
+
+import django.db.models.deletion
+import taggit.managers
+import utilities.json
+from django.db import migrations, models
+
+
+# Copy of the product row helpers of csaf.products at the time of this migration,
+# so later changes to them do not change what the migration stores.
+PRODUCT_ROW_FIELDS = ['name', 'vendor', 'product_name', 'version', 'cpe', 'purl']
+
+
+def get_product_row(product):
+    """
+    Return the columns of a CsafProduct for an entry of extract_csaf_products(), see PRODUCT_ROW_FIELDS.
+    Vendor, product name and version are taken from the nearest branch of the matching category.
+    """
+    helper = product.get('product_identification_helper')
+    if not isinstance(helper, dict):
+        helper = {}
+    lineage = product.get('_lineage') or []
+
+    def branch_name(*categories):
+        for category in categories:
+            for entry in reversed(lineage):
+                if entry.get('category') == category and entry.get('name'):
+                    return entry.get('name')
+        return None
+
+    purl = helper.get('purl')
+    if not purl and isinstance(helper.get('purls'), list) and helper['purls']:
+        purl = helper['purls'][0]
+    return {
+        'name': product.get('name') if isinstance(product.get('name'), str) else None,
+        'vendor': branch_name('vendor'),
+        'product_name': branch_name('product_name', 'product_family'),
+        'version': branch_name('product_version_range', 'product_version', 'service_pack', 'patch_level'),
+        'cpe': helper.get('cpe') if isinstance(helper.get('cpe'), str) else None,
+        'purl': purl if isinstance(purl, str) else None,
+    }
+
+
+def backfill_products(apps, schema_editor):
+    CsafDocument = apps.get_model('csaf', 'CsafDocument')
+    CsafProduct = apps.get_model('csaf', 'CsafProduct')
+
+    def truncate(field, value):
+        max_length = CsafProduct._meta.get_field(field).max_length
+        return value[:max_length] if value is not None else None
+
+    # product_index is backfilled by migration 0024.
+    documents = CsafDocument.objects.filter(product_index__isnull=False).only('id', 'product_index')
+    for document in documents.iterator():
+        products = []
+        for product_id, entry in document.product_index.items():
+            if entry['product'] is None:
+                continue
+            row = get_product_row(entry['product'])
+            products.append(CsafProduct(
+                csaf_document_id=document.pk,
+                product_id=product_id,
+                **{field: truncate(field, row[field]) for field in PRODUCT_ROW_FIELDS},
+            ))
+        CsafProduct.objects.bulk_create(products, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0024_csafdocument_product_index'),
+        ('extras', '0128_tableconfig'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CsafProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True, null=True)),
+                ('last_updated', models.DateTimeField(auto_now=True, null=True)),
+                ('custom_field_data', models.JSONField(blank=True, default=dict, encoder=utilities.json.CustomFieldJSONEncoder)),
+                ('product_id', models.CharField()),
+                ('name', models.CharField(blank=True, max_length=1000, null=True)),
+                ('vendor', models.CharField(blank=True, max_length=255, null=True)),
+                ('product_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('version', models.CharField(blank=True, max_length=255, null=True)),
+                ('cpe', models.CharField(blank=True, max_length=1000, null=True)),
+                ('purl', models.CharField(blank=True, max_length=1000, null=True)),
+                ('csaf_document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='csaf.csafdocument')),
+                ('tags', taggit.managers.TaggableManager(through='extras.TaggedItem', to='extras.Tag')),
+            ],
+            options={
+                'ordering': ['id'],
+                'constraints': [models.UniqueConstraint(fields=('csaf_document', 'product_id'), name='csafproduct_unique_product_per_doc')],
+                'indexes': [
+                    models.Index(fields=['product_id'], name='csafproduct_product_id'),
+                    models.Index(fields=['vendor', 'product_name'], name='csafproduct_vendor_product'),
+                    models.Index(fields=['cpe'], name='csafproduct_cpe'),
+                    models.Index(fields=['purl'], name='csafproduct_purl'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('csaf', '0025_csafproduct'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='csafproduct',
+            name='csafproduct_vendor_product',
+        ),
+        migrations.AddIndex(
+            model_name='csafproduct',
+            index=models.Index(django.db.models.functions.text.Upper('vendor'), django.db.models.functions.text.Upper('product_name'), name='csafproduct_vendor_product'),
+        ),
+        migrations.AddIndex(
+            model_name='csafproduct',
+            index=models.Index(django.db.models.functions.text.Upper('version'), name='csafproduct_version'),
+        ),
+        migrations.AddIndex(
+            model_name='csafproduct',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='csafproduct_name'),
+        ),
+    ]
@@ -1,8 +1,58 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.lookups import Exact, GreaterThan
+from django.db.models.functions import Coalesce, Upper
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.utils import timezone
 from netbox.models import NetBoxModel
+from utilities.querysets import RestrictedQuerySet
+
+BULK_BATCH_SIZE = 1000
+# Fields of CsafMatch that affect the derived counters, remembered on load, see CsafMatch.from_db().
+LOADED_MATCH_FIELDS = ('csaf_document_id', 'device_id', 'module_id', 'software_id', 'acceptance_status')
+# Large JSON fields of CsafDocument, deferred by the list and match querysets that do not show them.
+DOCUMENT_CONTENT_FIELDS = ('product_tree', 'product_index')
+MATCH_DEFERRED_DOCUMENT_FIELDS = tuple(f'csaf_document__{field}' for field in DOCUMENT_CONTENT_FIELDS)
+# Remediation counters of CsafMatch as (total, resolved, in progress), see CsafMatch.remediation_rollup().
+REMEDIATION_COUNTER_FIELDS = ('remediation_total_count', 'remediation_resolved_count', 'remediation_in_progress_count')
+
+
+class CsafDocumentQuerySet(RestrictedQuerySet):
+    """
+    QuerySet for CsafDocument, maintaining the denormalized match counters.
+    """
+
+    def refresh_match_counts(self):
+        """
+        Recompute the match counters of all documents in this queryset with a single UPDATE.
+        The document rows are locked first, so concurrent recomputations of a document run one after
+        another and the later one counts the matches committed by the earlier one.
+        """
+        def count(**filters):
+            return Coalesce(Subquery(
+                CsafMatch.objects
+                    .filter(csaf_document=OuterRef('pk'), **filters)
+                    .order_by()
+                    .values('csaf_document')
+                    .annotate(c=Count('*'))
+                    .values('c')
+            ), 0)
+
+        with transaction.atomic():
+            list(self.select_for_update().order_by('pk').values_list('pk', flat=True))
+            return self.update(
+                new_match_count=count(acceptance_status__in=[
+                    CsafMatch.AcceptanceStatus.NEW,
+                    CsafMatch.AcceptanceStatus.REOPENED,
+                ]),
+                confirmed_match_count=count(acceptance_status=CsafMatch.AcceptanceStatus.CONFIRMED),
+                false_positive_match_count=count(acceptance_status=CsafMatch.AcceptanceStatus.FALSE_POSITIVE),
+                total_match_count=count(),
+            )
+
 
 class CsafDocument(NetBoxModel):
     """
@@ -45,10 +95,48 @@ class CsafDocument(NetBoxModel):
         blank=True,
         null=True
     )
+    # Products of product_tree by product id, see products.build_product_index().
+    product_index = models.JSONField(
+        blank=True,
+        null=True,
+        editable=False
+    )
     next_retry_at = models.DateTimeField(
         blank=True,
         null=True
     )
+    # SHA-256 of the last fetched payload and of the vulnerability rows extracted from it.
+    # Used to skip the vulnerability sync when a document is fetched again without changes.
+    content_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True
+    )
+    vulnerabilities_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True
+    )
+    # Match counters per acceptance bucket, maintained by the signal handlers in signals.py
+    # and by the bulk match operations. New includes reopened matches.
+    new_match_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    confirmed_match_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    false_positive_match_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    total_match_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+
+    objects = CsafDocumentQuerySet.as_manager()
 
     class Meta:
         ordering = ['id']
@@ -57,11 +145,147 @@ class CsafDocument(NetBoxModel):
     def __str__(self):
         return self.title
 
+    @cached_property
+    def match_statistics(self):
+        """
+        Number of matches of this document per acceptance status, computed with one conditional aggregate
+        and memoized on the instance, so all tab badges and views of a request share it.
+        """
+        AcceptanceStatus = CsafMatch.AcceptanceStatus
+        return CsafMatch.objects.filter(csaf_document=self).aggregate(
+            new=Count('id', filter=Q(acceptance_status=AcceptanceStatus.NEW)),
+            reopened=Count('id', filter=Q(acceptance_status=AcceptanceStatus.REOPENED)),
+            confirmed=Count('id', filter=Q(acceptance_status=AcceptanceStatus.CONFIRMED)),
+            false_positive=Count('id', filter=Q(acceptance_status=AcceptanceStatus.FALSE_POSITIVE)),
+        )
+
     @property
     def docs_url(self):
         return None
 
 
+class CsafMatchQuerySet(RestrictedQuerySet):
+    """
+    QuerySet for CsafMatch, offering set-based variants of the per-match remediation helpers.
+    """
+
+    def sync_vulnerability_remediations(self):
+        """
+        Set-based variant of CsafMatch.sync_vulnerability_remediations() for all matches in this queryset.
+        """
+        matches = list(self.values_list('id', 'csaf_document_id', 'product_name_id'))
+        if not matches:
+            return
+        match_ids = [match_id for match_id, _, _ in matches]
+        document_ids = {document_id for _, document_id, _ in matches}
+
+        product_ids = {(product_name_id or '').strip() for _, _, product_name_id in matches} - {''}
+        vulnerabilities_by_product = {}
+        link_rows = CsafVulnerabilityProduct.objects.filter(
+            csaf_document_id__in=document_ids,
+            product_id__in=product_ids,
+        ).values_list('csaf_document_id', 'product_id', 'vulnerability_id')
+        for document_id, product_id, vulnerability_id in link_rows:
+            vulnerabilities_by_product.setdefault((document_id, product_id), set()).add(vulnerability_id)
+
+        wanted = {}
+        for match_id, document_id, product_name_id in matches:
+            product_id = (product_name_id or '').strip()
+            wanted[match_id] = vulnerabilities_by_product.get((document_id, product_id), set()) if product_id else set()
+
+        stale_ids = []
+        existing = {match_id: set() for match_id in match_ids}
+        remediation_rows = CsafMatchVulnerabilityRemediation.objects.filter(
+            match_id__in=match_ids,
+        ).values_list('id', 'match_id', 'vulnerability_id')
+        for entry_id, match_id, vulnerability_id in remediation_rows:
+            if vulnerability_id in wanted[match_id]:
+                existing[match_id].add(vulnerability_id)
+            else:
+                stale_ids.append(entry_id)
+
+        CsafMatchVulnerabilityRemediation.objects.bulk_create(
+            [
+                CsafMatchVulnerabilityRemediation(
+                    match_id=match_id,
+                    vulnerability_id=vulnerability_id,
+                    remediation_status=CsafMatch.RemediationStatus.NEW,
+                )
+                for match_id, vulnerability_ids in wanted.items()
+                for vulnerability_id in vulnerability_ids - existing[match_id]
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        if stale_ids:
+            CsafMatchVulnerabilityRemediation.objects.filter(pk__in=stale_ids).delete()
+        self.model.objects.filter(pk__in=match_ids).update_remediation_from_vulnerabilities()
+        self.model.objects.filter(pk__in=match_ids, remediations_dirty=True).update(remediations_dirty=False)
+
+    def mark_remediations_dirty(self, vulnerability_products):
+        """
+        Mark the matches in this queryset affected by the given (csaf_document_id, product_ids) pairs of
+        vulnerabilities as dirty, so their remediation entries are synced the next time they are shown.
+        Returns the number of marked matches.
+        """
+        condition = Q()
+        for document_id, product_ids in vulnerability_products:
+            product_ids = {(product_id or '').strip() for product_id in product_ids or []} - {''}
+            if document_id is not None and product_ids:
+                condition |= Q(csaf_document_id=document_id, product_name_id__in=product_ids)
+        if not condition:
+            return 0
+        return self.filter(condition, remediations_dirty=False).update(remediations_dirty=True)
+
+    def sync_dirty_vulnerability_remediations(self):
+        """
+        Sync the remediation entries of those matches in this queryset that are marked as dirty.
+        """
+        self.filter(remediations_dirty=True).sync_vulnerability_remediations()
+
+    def set_vulnerability_remediations(self, remediation_status):
+        """
+        Set-based variant of CsafMatch.set_all_vulnerability_remediations() for the confirmed matches in this
+        queryset, updating their remediation entries and rollup status without loading any of them.
+        Returns the number of updated matches.
+        """
+        confirmed = self.filter(acceptance_status=self.model.AcceptanceStatus.CONFIRMED)
+        confirmed.sync_dirty_vulnerability_remediations()
+        CsafMatchVulnerabilityRemediation.objects.filter(
+            match__in=confirmed.values('pk'),
+        ).update(remediation_status=remediation_status)
+        return confirmed.update_remediation_from_vulnerabilities()
+
+    def update_remediation_from_vulnerabilities(self):
+        """
+        Set-based variant of CsafMatch.update_remediation_from_vulnerabilities(), recomputing the
+        remediation counters and the rollup status with a single UPDATE.
+        """
+        RemediationStatus = self.model.RemediationStatus
+
+        def count(**filters):
+            return Coalesce(Subquery(
+                CsafMatchVulnerabilityRemediation.objects
+                    .filter(match=OuterRef('pk'), **filters)
+                    .order_by()
+                    .values('match')
+                    .annotate(c=Count('*'))
+                    .values('c')
+            ), 0)
+
+        counters = dict(zip(REMEDIATION_COUNTER_FIELDS, (
+            count(),
+            count(remediation_status=RemediationStatus.RESOLVED),
+            count(remediation_status=RemediationStatus.IN_PROGRESS),
+        )))
+        updated = self.update(
+            **counters,
+            remediation_status=self.model.remediation_rollup(*counters.values()),
+        )
+        CsafAssetSummary.objects.refresh_for_matches(self)
+        return updated
+
+
 class CsafMatch(NetBoxModel):
     """
     A CsafMatch instance links a CSAF advisory to an asset.
@@ -125,6 +349,28 @@ class CsafMatch(NetBoxModel):
         blank=True,
         null=True
     )
+    # Counters over the remediation entries of the match, maintained by CsafMatchVulnerabilityRemediation
+    # writes and by update_remediation_from_vulnerabilities().
+    remediation_total_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    remediation_resolved_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    remediation_in_progress_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    # Set when the remediation entries may no longer reflect the related vulnerabilities,
+    # cleared by sync_vulnerability_remediations().
+    remediations_dirty = models.BooleanField(
+        default=True,
+        editable=False
+    )
+
+    objects = CsafMatchQuerySet.as_manager()
 
     class Meta:
         ordering = ['id']
@@ -136,6 +382,29 @@ class CsafMatch(NetBoxModel):
                 nulls_distinct=False)
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values, so the signal handlers can tell which counters are affected by a save.
+        instance._loaded_values = {
+            field: getattr(instance, field)
+            for field in LOADED_MATCH_FIELDS
+            if field in instance.__dict__
+        }
+        if 'product_name_id' in instance.__dict__:
+            instance._loaded_product = (instance.csaf_document_id, instance.product_name_id)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The related vulnerabilities depend on the document and product id, see related_vulnerabilities.
+        product = (self.csaf_document_id, self.product_name_id)
+        if getattr(self, '_loaded_product', None) != product:
+            self.remediations_dirty = True
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'remediations_dirty'}
+        super().save(*args, **kwargs)
+        self._loaded_product = product
+
     @property
     def docs_url(self):
         return None
@@ -145,11 +414,37 @@ class CsafMatch(NetBoxModel):
         """
         Return only vulnerabilities relevant for this match's product identifier.
         """
+        related = getattr(self, '_related_vulnerabilities', None)
+        if related is not None:
+            return related
         product_id = (self.product_name_id or '').strip()
-        vulnerabilities = self.csaf_document.vulnerabilities.all()
         if not product_id:
-            return []
-        return [v for v in vulnerabilities if v.matches_product_id(product_id)]
+            return CsafVulnerability.objects.none()
+        return CsafVulnerability.objects.filter(
+            csaf_document_id=self.csaf_document_id,
+            products__product_id=product_id,
+        )
+
+    @classmethod
+    def attach_related_vulnerabilities(cls, matches):
+        """
+        Load related_vulnerabilities for all given matches with one query and keep the result on the instances.
+        """
+        matches = [match for match in matches if match.pk is not None]
+        keys = {(match.csaf_document_id, (match.product_name_id or '').strip()) for match in matches}
+        keys = {key for key in keys if key[1]}
+        related = {}
+        if keys:
+            condition = Q()
+            for document_id, product_id in keys:
+                condition |= Q(csaf_document_id=document_id, product_id=product_id)
+            links = CsafVulnerabilityProduct.objects.filter(condition).select_related('vulnerability')
+            for link in links.order_by('vulnerability_id'):
+                related.setdefault((link.csaf_document_id, link.product_id), []).append(link.vulnerability)
+        for match in matches:
+            match._related_vulnerabilities = related.get(
+                (match.csaf_document_id, (match.product_name_id or '').strip()), []
+            )
 
     @property
     def related_vulnerability_entries(self):
@@ -207,39 +502,51 @@ class CsafMatch(NetBoxModel):
         return self.vulnerability_remediation_map.get(vulnerability.id, self.RemediationStatus.NEW)
 
     def sync_vulnerability_remediations(self):
-        vulnerabilities = list(self.related_vulnerabilities)
-        vulnerability_ids = [v.id for v in vulnerabilities]
+        self.__class__.objects.filter(pk=self.pk).sync_vulnerability_remediations()
+        self.refresh_from_db(fields=[*REMEDIATION_COUNTER_FIELDS, 'remediation_status', 'remediations_dirty'])
 
-        existing = {
-            entry.vulnerability_id: entry
-            for entry in self.vulnerability_statuses.all()
-        }
-
-        for vulnerability in vulnerabilities:
-            if vulnerability.id not in existing:
-                CsafMatchVulnerabilityRemediation.objects.create(
-                    match=self,
-                    vulnerability=vulnerability,
-                    remediation_status=self.RemediationStatus.NEW,
-                )
-
-        self.vulnerability_statuses.exclude(vulnerability_id__in=vulnerability_ids).delete()
-        self.update_remediation_from_vulnerabilities()
+    @classmethod
+    def remediation_rollup(cls, total, resolved, in_progress):
+        """
+        Return an expression deriving the remediation status of a match from its remediation counters:
+        complete once all entries are resolved, in progress once any entry is started.
+        """
+        return Case(
+            When(Exact(total, 0), then=Value(cls.RemediationStatus.NEW)),
+            When(Exact(resolved, total), then=Value(cls.RemediationStatus.RESOLVED)),
+            When(GreaterThan(resolved + in_progress, 0), then=Value(cls.RemediationStatus.IN_PROGRESS)),
+            default=Value(cls.RemediationStatus.NEW),
+            output_field=models.CharField(),
+        )
 
     def update_remediation_from_vulnerabilities(self):
-        statuses = list(self.vulnerability_statuses.values_list('remediation_status', flat=True))
-        if not statuses:
-            target_status = self.RemediationStatus.NEW
-        elif all(status == self.RemediationStatus.RESOLVED for status in statuses):
-            target_status = self.RemediationStatus.RESOLVED
-        elif any(status in (self.RemediationStatus.IN_PROGRESS, self.RemediationStatus.RESOLVED) for status in statuses):
-            target_status = self.RemediationStatus.IN_PROGRESS
-        else:
-            target_status = self.RemediationStatus.NEW
+        self.__class__.objects.filter(pk=self.pk).update_remediation_from_vulnerabilities()
+        self.refresh_from_db(fields=[*REMEDIATION_COUNTER_FIELDS, 'remediation_status'])
 
-        if self.remediation_status != target_status:
-            self.remediation_status = target_status
-            self.__class__.objects.filter(pk=self.pk).update(remediation_status=target_status)
+    def apply_remediation_change(self, removed=None, added=None):
+        """
+        Adjust the remediation counters and status for one remediation entry whose status changed from
+        removed to added, None standing for an entry that was created or deleted.
+        """
+        field_for_status = {
+            self.RemediationStatus.RESOLVED: 'remediation_resolved_count',
+            self.RemediationStatus.IN_PROGRESS: 'remediation_in_progress_count',
+        }
+        deltas = dict.fromkeys(REMEDIATION_COUNTER_FIELDS, 0)
+        for status, step in ((removed, -1), (added, 1)):
+            if status is None:
+                continue
+            deltas['remediation_total_count'] += step
+            if status in field_for_status:
+                deltas[field_for_status[status]] += step
+        if any(deltas.values()):
+            counters = {field: F(field) + delta for field, delta in deltas.items()}
+            self.__class__.objects.filter(pk=self.pk).update(
+                **counters,
+                remediation_status=self.remediation_rollup(*counters.values()),
+            )
+            self.refresh_from_db(fields=[*REMEDIATION_COUNTER_FIELDS, 'remediation_status'])
+        CsafAssetSummary.objects.refresh_for_match(self)
 
     def set_all_vulnerability_remediations(self, remediation_status):
         if self.acceptance_status != self.AcceptanceStatus.CONFIRMED:
@@ -260,14 +567,17 @@ class CsafMatch(NetBoxModel):
         if entry.remediation_status != remediation_status:
             entry.remediation_status = remediation_status
             entry.save(update_fields=['remediation_status'])
-        self.update_remediation_from_vulnerabilities()
 
     @property
     def remediation_progress(self):
-        statuses = list(self.vulnerability_statuses.values_list('remediation_status', flat=True))
-        total = len(statuses)
-        resolved = sum(1 for status in statuses if status == self.RemediationStatus.RESOLVED)
-        in_progress = sum(1 for status in statuses if status == self.RemediationStatus.IN_PROGRESS)
+        return self.get_remediation_progress(
+            self.remediation_resolved_count,
+            self.remediation_in_progress_count,
+            self.remediation_total_count,
+        )
+
+    @staticmethod
+    def get_remediation_progress(resolved, in_progress, total):
         resolved_percentage = int((resolved * 100) / total) if total else 0
         in_progress_percentage = int((in_progress * 100) / total) if total else 0
         return {
@@ -279,6 +589,22 @@ class CsafMatch(NetBoxModel):
         }
 
 
+class CsafVulnerabilityQuerySet(RestrictedQuerySet):
+    """
+    QuerySet for CsafVulnerability, answering product lookups in the database.
+    """
+
+    def affecting_products(self, product_ids):
+        """
+        Restrict to vulnerabilities listing any of the given product ids. Each containment test on
+        product_ids is served by the GIN index of the field.
+        """
+        condition = Q()
+        for product_id in product_ids:
+            condition |= Q(product_ids__contains=[product_id])
+        return self.filter(condition) if condition else self.none()
+
+
 class CsafVulnerability(NetBoxModel):
     """
     A CsafVulnerability instance represents one vulnerability entry of a CSAF document.
@@ -322,6 +648,8 @@ class CsafVulnerability(NetBoxModel):
         default=list,
     )
 
+    objects = CsafVulnerabilityQuerySet.as_manager()
+
     class Meta:
         ordering = ['id']
         constraints = [
@@ -330,15 +658,25 @@ class CsafVulnerability(NetBoxModel):
                 name='csafvulnerability_unique_ordinal_per_doc',
             )
         ]
+        indexes = [
+            GinIndex(
+                fields=['product_ids'],
+                name='csafvulnerability_product_ids',
+                opclasses=['jsonb_path_ops'],
+            )
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored products, so the signal handlers can tell whether the product links changed.
+        if 'product_ids' in instance.__dict__ and 'csaf_document_id' in instance.__dict__:
+            instance._loaded_products = (instance.csaf_document_id, list(instance.product_ids or []))
+        return instance
 
     def __str__(self):
         return self.vulnerability_id
 
-    def matches_product_id(self, product_id):
-        if not product_id:
-            return False
-        return product_id in (self.product_ids or [])
-
     @property
     def cvss_severity(self):
         score = self.cvss_base_score
@@ -382,13 +720,150 @@ class CsafVulnerability(NetBoxModel):
 
     @property
     def related_matches(self):
-        product_ids = self.product_ids or []
-        if not product_ids:
-            return CsafMatch.objects.none()
         return CsafMatch.objects.filter(
-            csaf_document=self.csaf_document,
-            product_name_id__in=product_ids,
-        ).select_related('device', 'module', 'software', 'csaf_document')
+            csaf_document_id=self.csaf_document_id,
+            product_name_id__in=self.products.values('product_id'),
+        ).select_related('device', 'module', 'software', 'csaf_document').defer(*MATCH_DEFERRED_DOCUMENT_FIELDS)
+
+
+class CsafVulnerabilityProductQuerySet(models.QuerySet):
+    """
+    QuerySet for CsafVulnerabilityProduct, rebuilding the rows from the product_ids of vulnerabilities.
+    """
+
+    def rebuild_for(self, vulnerabilities):
+        """
+        Replace the rows of the given CsafVulnerability instances by the entries of their product_ids.
+        """
+        vulnerabilities = [vulnerability for vulnerability in vulnerabilities if vulnerability.pk is not None]
+        if not vulnerabilities:
+            return
+        self.filter(vulnerability_id__in=[vulnerability.pk for vulnerability in vulnerabilities]).delete()
+        self.bulk_create(
+            [
+                self.model(
+                    vulnerability_id=vulnerability.pk,
+                    csaf_document_id=vulnerability.csaf_document_id,
+                    product_id=product_id,
+                )
+                for vulnerability in vulnerabilities
+                for product_id in set(vulnerability.product_ids or [])
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+
+class CsafVulnerabilityProduct(models.Model):
+    """
+    One product id a CsafVulnerability applies to, the relational form of CsafVulnerability.product_ids.
+    The rows are derived data, rebuilt whenever the vulnerabilities of a document are synced, so the
+    vulnerabilities of a match are found with an indexed join on (csaf_document, product_id).
+    """
+    vulnerability = models.ForeignKey(
+        to='csaf.CsafVulnerability',
+        on_delete=models.CASCADE,
+        related_name='products',
+    )
+    csaf_document = models.ForeignKey(
+        to='csaf.CsafDocument',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    product_id = models.CharField(
+        blank=False,
+        null=False,
+    )
+
+    objects = CsafVulnerabilityProductQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['csaf_document', 'product_id'],
+                name='csafvulnproduct_doc_product',
+            )
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['vulnerability', 'product_id'],
+                name='csafvulnproduct_unique',
+            )
+        ]
+
+
+class CsafProduct(NetBoxModel):
+    """
+    A CsafProduct instance represents one product of the product tree of a CSAF document.
+    The rows are derived from the product tree whenever the document is synced.
+    """
+    csaf_document = models.ForeignKey(
+        to='csaf.CsafDocument',
+        on_delete=models.CASCADE,
+        related_name='products',
+    )
+    product_id = models.CharField(
+        blank=False,
+        null=False,
+    )
+    name = models.CharField(
+        max_length=1000,
+        blank=True,
+        null=True,
+    )
+    vendor = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+    )
+    product_name = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+    )
+    version = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+    )
+    cpe = models.CharField(
+        max_length=1000,
+        blank=True,
+        null=True,
+    )
+    purl = models.CharField(
+        max_length=1000,
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['csaf_document', 'product_id'],
+                name='csafproduct_unique_product_per_doc',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['product_id'], name='csafproduct_product_id'),
+            # Expression indexes for the case-insensitive filters of CsafProductFilterSet.
+            models.Index(Upper('vendor'), Upper('product_name'), name='csafproduct_vendor_product'),
+            models.Index(Upper('version'), name='csafproduct_version'),
+            models.Index(Upper('name'), name='csafproduct_name'),
+            models.Index(fields=['cpe'], name='csafproduct_cpe'),
+            models.Index(fields=['purl'], name='csafproduct_purl'),
+        ]
+
+    def __str__(self):
+        return self.name or self.product_id
+
+    @property
+    def related_vulnerabilities(self):
+        return CsafVulnerability.objects.filter(
+            csaf_document_id=self.csaf_document_id,
+            products__product_id=self.product_id,
+        )
 
 
 class CsafMatchVulnerabilityRemediation(NetBoxModel):
@@ -420,11 +895,150 @@ class CsafMatchVulnerabilityRemediation(NetBoxModel):
             )
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status, so a save only adjusts the counters of the match, see save().
+        if 'remediation_status' in instance.__dict__:
+            instance._loaded_status = instance.remediation_status
+        return instance
+
     def save(self, *args, **kwargs):
+        adding = self._state.adding
         super().save(*args, **kwargs)
-        self.match.update_remediation_from_vulnerabilities()
+        if adding:
+            self.match.apply_remediation_change(added=self.remediation_status)
+        elif hasattr(self, '_loaded_status'):
+            self.match.apply_remediation_change(removed=self._loaded_status, added=self.remediation_status)
+        else:
+            self.match.update_remediation_from_vulnerabilities()
+        self._loaded_status = self.remediation_status
+
+
+class CsafAssetSummaryQuerySet(models.QuerySet):
+    """
+    QuerySet for CsafAssetSummary, recomputing the summaries of given assets.
+    """
+
+    def refresh_for_match(self, match):
+        for field in self.model.ASSET_FIELDS:
+            asset_id = getattr(match, f'{field}_id')
+            if asset_id is not None:
+                self.refresh(field, [asset_id])
+
+    def refresh_for_matches(self, matches):
+        """
+        Refresh the summaries of all assets referenced by the given CsafMatch queryset.
+        """
+        asset_ids = {field: set() for field in self.model.ASSET_FIELDS}
+        for row in matches.order_by().values_list(*self.model.ASSET_FIELDS).distinct():
+            for field, asset_id in zip(self.model.ASSET_FIELDS, row):
+                if asset_id is not None:
+                    asset_ids[field].add(asset_id)
+        for field, ids in asset_ids.items():
+            self.refresh(field, ids)
+
+    def refresh(self, field, ids):
+        """
+        Recompute the summaries of the assets with the given ids, field being 'device', 'module' or 'software'.
+        Assets without matches have no summary row.
+        """
+        ids = set(ids)
+        if not ids:
+            return
+        AcceptanceStatus = CsafMatch.AcceptanceStatus
+        RemediationStatus = CsafMatch.RemediationStatus
+        summaries = {}
+        match_counts = CsafMatch.objects.filter(
+            **{f'{field}__in': ids}
+        ).order_by().values(field).annotate(
+            new_match_count=Count('id', filter=Q(acceptance_status=AcceptanceStatus.NEW)),
+            reopened_match_count=Count('id', filter=Q(acceptance_status=AcceptanceStatus.REOPENED)),
+            confirmed_match_count=Count('id', filter=Q(acceptance_status=AcceptanceStatus.CONFIRMED)),
+            false_positive_match_count=Count('id', filter=Q(acceptance_status=AcceptanceStatus.FALSE_POSITIVE)),
+        )
+        for row in match_counts:
+            asset_id = row.pop(field)
+            summaries[asset_id] = self.model(**{f'{field}_id': asset_id}, **row)
+        vulnerability_counts = CsafMatchVulnerabilityRemediation.objects.filter(
+            **{f'match__{field}__in': summaries.keys()},
+            match__acceptance_status=AcceptanceStatus.CONFIRMED,
+        ).order_by().values(f'match__{field}').annotate(
+            open_vulnerability_count=Count('id', filter=Q(remediation_status=RemediationStatus.NEW)),
+            in_progress_vulnerability_count=Count('id', filter=Q(remediation_status=RemediationStatus.IN_PROGRESS)),
+            resolved_vulnerability_count=Count('id', filter=Q(remediation_status=RemediationStatus.RESOLVED)),
+        )
+        for row in vulnerability_counts:
+            summary = summaries[row.pop(f'match__{field}')]
+            for name, value in row.items():
+                setattr(summary, name, value)
+
+        self.filter(**{f'{field}__in': ids - summaries.keys()}).delete()
+        if summaries:
+            self.bulk_create(
+                summaries.values(),
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=[field],
+                update_fields=self.model.COUNT_FIELDS,
+            )
+
+
+class CsafAssetSummary(models.Model):
+    """
+    Per-asset counts of CSAF matches and of the vulnerabilities of its confirmed matches.
+    The rows are derived data, kept up to date by the signal handlers in signals.py and the remediation
+    helpers of CsafMatch, so the tab badges of an asset need a single lookup.
+    Exactly one of device, module and software is set.
+    """
+    ASSET_FIELDS = ('device', 'module', 'software')
+    COUNT_FIELDS = [
+        'new_match_count', 'reopened_match_count', 'confirmed_match_count', 'false_positive_match_count',
+        'open_vulnerability_count', 'in_progress_vulnerability_count', 'resolved_vulnerability_count',
+    ]
 
-    def delete(self, *args, **kwargs):
-        match = self.match
-        super().delete(*args, **kwargs)
-        match.update_remediation_from_vulnerabilities()
+    device = models.OneToOneField(
+        to='dcim.Device',
+        on_delete=models.CASCADE,
+        related_name='csaf_summary',
+        blank=True,
+        null=True,
+    )
+    module = models.OneToOneField(
+        to='dcim.Module',
+        on_delete=models.CASCADE,
+        related_name='csaf_summary',
+        blank=True,
+        null=True,
+    )
+    software = models.OneToOneField(
+        to='d3c.Software',
+        on_delete=models.CASCADE,
+        related_name='csaf_summary',
+        blank=True,
+        null=True,
+    )
+    new_match_count = models.PositiveIntegerField(default=0)
+    reopened_match_count = models.PositiveIntegerField(default=0)
+    confirmed_match_count = models.PositiveIntegerField(default=0)
+    false_positive_match_count = models.PositiveIntegerField(default=0)
+    open_vulnerability_count = models.PositiveIntegerField(default=0)
+    in_progress_vulnerability_count = models.PositiveIntegerField(default=0)
+    resolved_vulnerability_count = models.PositiveIntegerField(default=0)
+
+    objects = CsafAssetSummaryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        verbose_name_plural = 'CsafAssetSummaries'
+
+    @classmethod
+    def for_asset(cls, asset):
+        """
+        Return the summary of a Device, Module or Software, or None if it has no matches.
+        The result is cached on the asset, so several badges of one page share the lookup.
+        """
+        try:
+            return asset.csaf_summary
+        except cls.DoesNotExist:
+            return None
@@ -26,6 +26,12 @@ csafVulnerabilityItem = PluginMenuItem(
     permissions=('csaf.view_csafvulnerability',),
     buttons=()
 )
+csafProductItem = PluginMenuItem(
+    link='plugins:csaf:csafproduct_list',
+    link_text='CSAF Products',
+    permissions=('csaf.view_csafproduct',),
+    buttons=()
+)
 devicesWithMatches = PluginMenuItem(
     link='dcim:device_withmatches',
     link_text='Devices with Matches',
@@ -64,14 +70,14 @@ configuration = PluginMenuItem(
 )
 
 _menu_items_models = (
-    dashboard, csafDocumentItem, csafMatchItem, csafVulnerabilityItem, devicesWithMatches, modulesWithMatches, softwareWithMatches, synchronisers
+    dashboard, csafDocumentItem, csafMatchItem, csafVulnerabilityItem, csafProductItem, devicesWithMatches, modulesWithMatches, softwareWithMatches, synchronisers
 )
 
 
 menu = PluginMenu(
     label="CSAF",
     groups=(
-        ("Models", (dashboard, csafDocumentItem, csafMatchItem, csafVulnerabilityItem, devicesWithMatches, modulesWithMatches, softwareWithMatches,)),
+        ("Models", (dashboard, csafDocumentItem, csafMatchItem, csafVulnerabilityItem, csafProductItem, devicesWithMatches, modulesWithMatches, softwareWithMatches,)),
         ("Synchronisers", (synchronisers, configuration,)),
     ),
     icon_class="mdi mdi-gamma",
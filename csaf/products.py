@@ -0,0 +1,194 @@
+"""
+    Helpers for the product tree of CSAF documents.
+
+    The product index built by build_product_index() is stored with each CsafDocument,
+    so products can be looked up by product id without walking the tree again.
+"""
+
+
+def build_product_index(product_tree):
+    """
+    Return the products of a product tree keyed by product id, None if there is no tree.
+    Each entry holds 'product', the entry of extract_csaf_products() with path, lineage and helper fields,
+    and 'info', the product info of gatherProductInfoFromDoc().
+    """
+    if not product_tree:
+        return None
+    info = {
+        str(product_id).strip(): data
+        for product_id, data in gatherProductInfoIndex(product_tree).items()
+    }
+    index = {}
+    for product in extract_csaf_products(product_tree):
+        product_id = str(product.get('product_id', '')).strip()
+        if product_id and product_id not in index:
+            index[product_id] = {'product': product, 'info': info.get(product_id, {})}
+    for product_id, data in info.items():
+        index.setdefault(product_id, {'product': None, 'info': data})
+    return index
+
+
+def extract_csaf_products(product_tree):
+    products = []
+    known_branch_categories = {
+        'architecture',
+        'host_name',
+        'language',
+        'legacy',
+        'patch_level',
+        'product_family',
+        'product_name',
+        'product_version',
+        'product_version_range',
+        'service_pack',
+        'specification',
+        'vendor',
+    }
+
+    def walk(node, path, lineage):
+        if isinstance(node, dict):
+            category = node.get('category')
+            name = node.get('name')
+            include_in_lineage = category in known_branch_categories and isinstance(name, str) and bool(name.strip())
+            current_path = path + ([name] if include_in_lineage else [])
+            current_lineage = lineage + ([{'category': category, 'name': name}] if include_in_lineage else [])
+
+            product = node.get('product')
+            if isinstance(product, dict):
+                entry = dict(product)
+                entry['_branch_category'] = category
+                entry['_branch_name'] = name
+                if current_path:
+                    entry['path'] = current_path
+                if current_lineage:
+                    entry['_lineage'] = current_lineage
+                products.append(entry)
+
+            full_product_names = node.get('full_product_names')
+            if isinstance(full_product_names, list):
+                for item in full_product_names:
+                    if isinstance(item, dict):
+                        entry = dict(item)
+                        entry['_branch_category'] = category
+                        entry['_branch_name'] = name
+                        if current_path:
+                            entry['path'] = current_path
+                        if current_lineage:
+                            entry['_lineage'] = current_lineage
+                        products.append(entry)
+
+            if 'product_id' in node and 'name' in node and category in known_branch_categories:
+                entry = dict(node)
+                entry['_branch_category'] = category
+                entry['_branch_name'] = name
+                if current_path:
+                    entry['path'] = current_path
+                if current_lineage:
+                    entry['_lineage'] = current_lineage
+                products.append(entry)
+
+            for branch in node.get('branches', []) or []:
+                walk(branch, current_path, current_lineage)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, path, lineage)
+
+    walk(product_tree or {}, [], [])
+    return products
+
+
+def gatherProductInfoFromDoc(doc, productNameId):
+    if not doc.product_tree:
+        return None
+    for branch in doc.product_tree.get('branches', []):
+        found, data = gatherProductInfoFromBranch(branch, productNameId)
+        if found:
+            return data
+    return {}
+
+
+def gatherProductInfoIndex(product_tree):
+    """
+    Return the product info of all products of a product tree by product id, walking the tree once.
+    The entries equal the results of gatherProductInfoFromDoc().
+    """
+    index = {}
+    for branch in (product_tree or {}).get('branches', []):
+        indexProductInfoFromBranch(branch, [], index)
+    return index
+
+
+def indexProductInfoFromBranch(branch, parents, index):
+    productNameId = getProductId(branch)
+    if productNameId is not None and productNameId not in index:
+        data = {}
+        addDataFromBranch(branch.get('product'), data)
+        addDataFromBranch(branch, data)
+        for parent in reversed(parents):
+            addDataFromBranch(parent, data)
+        index[productNameId] = data
+    parents.append(branch)
+    for sub in branch.get('branches', []):
+        indexProductInfoFromBranch(sub, parents, index)
+    parents.pop()
+
+
+def gatherProductInfoFromBranch(branch, productNameId):
+    if getProductId(branch) == productNameId:
+        data = {}
+        addDataFromBranch(branch.get('product'), data)
+        addDataFromBranch(branch, data)
+        return True, data
+    for sub in branch.get('branches', []):
+        found, data = gatherProductInfoFromBranch(sub, productNameId)
+        if found:
+            addDataFromBranch(branch, data)
+            return found, data
+    return False, {}
+
+
+def addDataFromBranch(branch, data):
+    if branch.get('category'):
+        category = branch.get('category', None)
+        if category and not data.get(category):
+            data[category] = branch.get('name')
+    if branch.get('product_id'):
+        data['product_name'] = branch.get('name')
+
+
+def getProductId(branch):
+    product = branch.get('product')
+    return product.get('product_id') if isinstance(product, dict) else None
+
+
+PRODUCT_ROW_FIELDS = ['name', 'vendor', 'product_name', 'version', 'cpe', 'purl']
+
+
+def get_product_row(product):
+    """
+    Return the columns of a CsafProduct for an entry of extract_csaf_products(), see PRODUCT_ROW_FIELDS.
+    Vendor, product name and version are taken from the nearest branch of the matching category.
+    """
+    helper = product.get('product_identification_helper')
+    if not isinstance(helper, dict):
+        helper = {}
+    lineage = product.get('_lineage') or []
+
+    def branch_name(*categories):
+        for category in categories:
+            for entry in reversed(lineage):
+                if entry.get('category') == category and entry.get('name'):
+                    return entry.get('name')
+        return None
+
+    purl = helper.get('purl')
+    if not purl and isinstance(helper.get('purls'), list) and helper['purls']:
+        purl = helper['purls'][0]
+    return {
+        'name': product.get('name') if isinstance(product.get('name'), str) else None,
+        'vendor': branch_name('vendor'),
+        'product_name': branch_name('product_name', 'product_family'),
+        'version': branch_name('product_version_range', 'product_version', 'service_pack', 'patch_level'),
+        'cpe': helper.get('cpe') if isinstance(helper.get('cpe'), str) else None,
+        'purl': purl if isinstance(purl, str) else None,
+    }
@@ -0,0 +1,124 @@
+import threading
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (CsafAssetSummary, CsafDocument, CsafMatch, CsafMatchVulnerabilityRemediation, CsafVulnerability,
+                     CsafVulnerabilityProduct, LOADED_MATCH_FIELDS)
+
+# Ids collected per thread (and thus per database connection) until the current transaction commits.
+pending = threading.local()
+
+
+def refreshDocumentCounts(documentIds):
+    documentIds = {documentId for documentId in documentIds if documentId is not None}
+    if documentIds:
+        CsafDocument.objects.filter(pk__in=documentIds).refresh_match_counts()
+
+
+def refreshAssetSummaries(matchValues):
+    for field in CsafAssetSummary.ASSET_FIELDS:
+        ids = {values.get(f'{field}_id') for values in matchValues} - {None}
+        CsafAssetSummary.objects.refresh(field, ids)
+
+
+def deferUntilCommit(name, values, refresh):
+    """
+    Collect values and pass all of them to refresh once the current transaction commits, so deleting many
+    rows in one transaction, e.g. a cascade, triggers a single refresh instead of one per row.
+    """
+    pending.__dict__.setdefault(name, set()).update(values)
+    transaction.on_commit(lambda: runDeferred(name, refresh))
+
+
+def runDeferred(name, refresh):
+    values = pending.__dict__.pop(name, None)
+    if values:
+        refresh(values)
+
+
+def isDeletedWith(origin, *modelClasses):
+    """
+    Whether a post_delete signal stems from deleting an instance or queryset of one of the given models.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, modelClasses)
+
+
+def getMatchValues(instance):
+    return {field: getattr(instance, field) for field in LOADED_MATCH_FIELDS}
+
+
+@receiver(post_save, sender=CsafMatch)
+def update_counts_on_match_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Refresh the document counters and asset summaries affected by a saved match.
+    """
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    current = getMatchValues(instance)
+    if not created and loaded == current:
+        return
+    refreshDocumentCounts([current['csaf_document_id'], loaded.get('csaf_document_id')])
+    refreshAssetSummaries([current, loaded])
+    instance._loaded_values = current
+
+
+@receiver(post_delete, sender=CsafMatch)
+def update_counts_on_match_delete(sender, instance, origin=None, **kwargs):
+    """
+    Refresh the document counters and asset summaries affected by deleted matches once the deletion
+    commits, so deleting a document or many matches refreshes each of them only once.
+    The counters of a document deleted along with its matches need no update.
+    """
+    if not isDeletedWith(origin, CsafDocument):
+        deferUntilCommit('matchDocumentIds', [instance.csaf_document_id], refreshDocumentCounts)
+    for field in CsafAssetSummary.ASSET_FIELDS:
+        assetId = getattr(instance, f'{field}_id')
+        if assetId is not None:
+            deferUntilCommit(
+                f'{field}SummaryIds',
+                [assetId],
+                lambda ids, field=field: CsafAssetSummary.objects.refresh(field, ids),
+            )
+
+
+@receiver(post_save, sender=CsafVulnerability)
+def rebuild_products_on_vulnerability_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the product links of a vulnerability saved outside of the document sync, e.g. by the edit view or the REST API.
+    """
+    if raw:
+        return
+    current = (instance.csaf_document_id, list(instance.product_ids or []))
+    if not created and getattr(instance, '_loaded_products', None) == current:
+        return
+    CsafVulnerabilityProduct.objects.rebuild_for([instance])
+    CsafMatch.objects.mark_remediations_dirty([current, getattr(instance, '_loaded_products', (None, []))])
+    instance._loaded_products = current
+
+
+@receiver(post_delete, sender=CsafVulnerability)
+def mark_matches_on_vulnerability_delete(sender, instance, **kwargs):
+    """
+    Mark the matches of a deleted vulnerability as dirty, so their remediation entries get synced again.
+    """
+    CsafMatch.objects.mark_remediations_dirty([(instance.csaf_document_id, instance.product_ids)])
+
+
+@receiver(post_delete, sender=CsafMatchVulnerabilityRemediation)
+def update_counters_on_remediation_delete(sender, instance, origin=None, **kwargs):
+    """
+    Recompute the remediation counters of the matches whose entries were deleted, including entries deleted
+    along with their vulnerability. Entries deleted along with their match or document need no update.
+    """
+    if isDeletedWith(origin, CsafMatch, CsafDocument):
+        return
+    deferUntilCommit(
+        'remediationMatchIds',
+        [instance.match_id],
+        lambda matchIds: CsafMatch.objects.filter(pk__in=matchIds).update_remediation_from_vulnerabilities(),
+    )
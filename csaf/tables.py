@@ -12,7 +12,7 @@ from django.middleware.csrf import get_token
 from django.utils.html import format_html, format_html_join
 from django.utils.translation import gettext_lazy as _
 from netbox.tables import NetBoxTable, columns
-from .models import (CsafDocument, CsafMatch, CsafVulnerability, CsafMatchVulnerabilityRemediation)
+from .models import (CsafDocument, CsafMatch, CsafProduct, CsafVulnerability, CsafMatchVulnerabilityRemediation)
 from d3c.models import Software
 from d3c.tables import SoftwareTable
 
@@ -32,6 +32,16 @@ def render_vulnerability_links(record):
     return format_html('{} (+{})', rendered, len(vulns) - 5)
 
 
+def attach_related_vulnerabilities(table):
+    """
+    Load the related vulnerabilities of all matches shown by the table in one query,
+    see CsafMatch.attach_related_vulnerabilities().
+    """
+    page = getattr(table, 'page', None)
+    rows = page.object_list if page is not None else table.rows
+    CsafMatch.attach_related_vulnerabilities(row.record for row in rows)
+
+
 def render_compare_link(record):
     if record.acceptance_status != CsafMatch.AcceptanceStatus.CONFIRMED:
         return '-'
@@ -142,15 +152,19 @@ class CsafDocumentTable(NetBoxTable):
         accessor='docurl',
         verbose_name='Link')
     new_count = tables.Column(
+        accessor='new_match_count',
         verbose_name=_('New')
     )
     confirmed_count = tables.Column(
+        accessor='confirmed_match_count',
         verbose_name=_('Confirmed')
     )
     resolved_count = tables.Column(
+        accessor='false_positive_match_count',
         verbose_name=_('False Positive')
     )
     total_count = tables.Column(
+        accessor='total_match_count',
         verbose_name=_('Total Matches')
     )
 
@@ -214,6 +228,9 @@ class CsafMatchListForDeviceTable(NetBoxTable):
         fields = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'link', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
         default_columns = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'link', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
 
+    def before_render(self, request):
+        attach_related_vulnerabilities(self)
+
     def render_vulnerabilities(self, record):
         return render_vulnerability_links(record)
 
@@ -300,6 +317,9 @@ class CsafMatchListForModuleTable(NetBoxTable):
     def render_comparison(self, record):
         return render_compare_link(record)
 
+    def before_render(self, request):
+        attach_related_vulnerabilities(self)
+
     def render_vulnerabilities(self, record):
         return render_vulnerability_links(record)
 
@@ -361,6 +381,9 @@ class CsafMatchListForCsafDocumentTable(NetBoxTable):
         fields = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
         default_columns = ('id', 'asset', 'type', 'product_name_id', 'tracking_id', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
 
+    def before_render(self, request):
+        attach_related_vulnerabilities(self)
+
     def render_vulnerabilities(self, record):
         return render_vulnerability_links(record)
 
@@ -438,6 +461,9 @@ class CsafMatchListForSoftwareTable(NetBoxTable):
         fields = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'link', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
         default_columns = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'link', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
 
+    def before_render(self, request):
+        attach_related_vulnerabilities(self)
+
     def render_vulnerabilities(self, record):
         return render_vulnerability_links(record)
 
@@ -515,6 +541,9 @@ class CsafMatchTable(NetBoxTable):
         fields = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'link', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
         default_columns = ('id', 'asset', 'type', 'product_name_id', 'csaf_document', 'tracking_id', 'link', 'score', 'vulnerabilities', 'comparison', 'time', 'acceptance_status', 'remediation_status', 'description')
 
+    def before_render(self, request):
+        attach_related_vulnerabilities(self)
+
     def render_vulnerabilities(self, record):
         return render_vulnerability_links(record)
 
@@ -646,6 +675,34 @@ class CsafVulnerabilityTable(NetBoxTable):
         return queryset.order_by(order, 'id'), True
 
 
+class CsafProductTable(NetBoxTable):
+    """
+        Table for the CsafProduct model.
+    """
+    csaf_document = tables.Column(
+        linkify=True
+    )
+    product_id = tables.Column(
+        linkify=True,
+        verbose_name='Product ID',
+    )
+    cpe = tables.Column(
+        verbose_name='CPE',
+    )
+    purl = tables.Column(
+        verbose_name='PURL',
+    )
+    # Only the change log, there are no edit and delete views for the derived products.
+    actions = columns.ActionsColumn(
+        actions=('changelog',),
+    )
+
+    class Meta(NetBoxTable.Meta):
+        model = CsafProduct
+        fields = ('id', 'csaf_document', 'product_id', 'name', 'vendor', 'product_name', 'version', 'cpe', 'purl')
+        default_columns = ('id', 'csaf_document', 'product_id', 'vendor', 'product_name', 'version', 'cpe', 'purl')
+
+
 class CsafAssetVulnerabilityTable(NetBoxTable):
     """
         Table showing vulnerabilities for an asset with their related CSAF match.
@@ -0,0 +1,31 @@
+import io
+import json
+import unittest
+
+from csaf.api.jsonstream import JsonStreamReader
+
+
+def readAll(text, chunkSize, streamedArrays=()):
+    reader = JsonStreamReader(io.BytesIO(text.encode('utf-8')), streamedArrays=streamedArrays, chunkSize=chunkSize)
+    result = {}
+    for key, value in reader.members():
+        result[key] = list(value) if key in streamedArrays else value
+    return result
+
+
+class JsonStreamReaderTestCase(unittest.TestCase):
+
+    DOCUMENT = '{"a": [1, 2], "b": 7.5, "c": 1.5e3, "d": -12, "e": true, "f": null, "g": "x\\u00e9y", "h": {"i": [0.25]}}'
+
+    def test_small_chunks(self):
+        expected = json.loads(self.DOCUMENT)
+        for chunkSize in range(1, len(self.DOCUMENT) + 2):
+            with self.subTest(chunkSize=chunkSize):
+                self.assertEqual(readAll(self.DOCUMENT, chunkSize), expected)
+
+    def test_streamed_array_small_chunks(self):
+        document = '{"vulnerabilities": [1.5, 2e-3, {"x": 10}, -0.5], "z": 100}'
+        expected = json.loads(document)
+        for chunkSize in range(1, len(document) + 2):
+            with self.subTest(chunkSize=chunkSize):
+                self.assertEqual(readAll(document, chunkSize, streamedArrays=('vulnerabilities',)), expected)
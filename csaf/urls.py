@@ -13,6 +13,9 @@ urlpatterns = (
     path('csafvulnerability/', include(get_model_urls('csaf', 'csafvulnerability', detail=False))),
     path('csafvulnerability/<int:pk>/', include(get_model_urls('csaf', 'csafvulnerability'))),
 
+    path('csafproduct/', include(get_model_urls('csaf', 'csafproduct', detail=False))),
+    path('csafproduct/<int:pk>/', include(get_model_urls('csaf', 'csafproduct'))),
+
     path('synchronisers/', views.Synchronisers.as_view(), name='synchronisers'),
     path('config/', views.Config.as_view(), name='config'),
     path('update-config/', views.UpdateConfigView.as_view(), name='update-config'),
@@ -1,21 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from datetime import datetime
+import hashlib
 import json
 import logging
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
 import requests
 import time
-from csaf.api.views import getFromJson, getToken, createDocumentForData
+from csaf.api.views import getFromJson, getToken, invalidateToken, createDocumentForData, logMatchChanges, tokenCache
 from dcim.filtersets import DeviceFilterSet, ModuleFilterSet
 from dcim.forms.filtersets import DeviceFilterForm, ModuleFilterForm
 from dcim.models import Device, DeviceType, Module, Manufacturer
 from django.contrib import messages
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models import Count, F, Q
 from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.html import format_html
 from django.views.generic import View
+from netbox.jobs import JobRunner, system_job
 from netbox.views import generic
 from utilities.exceptions import PermissionsViolation
 from utilities.htmx import htmx_partial
@@ -27,6 +34,7 @@ from d3c.forms import SoftwareFilterForm
 from d3c.models import Software
 
 OK_LABEL = 'OK'
+TIMED_OUT = object()
 
 CLEAR_TABLE = {
     'all': {'title':'All'}, 
@@ -35,6 +43,17 @@ CLEAR_TABLE = {
     'csaf': {'title':'CSAF Docs'}
 }
 
+BULK_ACTION_ACCEPTANCE = 'acceptance'
+BULK_ACTION_REMEDIATION = 'remediation'
+
+ACTIVE_RUN_STATES = {'running', 'stop_requested', 'stopping', 'stopped'}
+HISTORY_SEED_LIMIT = 1000
+HISTORY_FETCH_WINDOW = 50
+HISTORY_PAGE_SIZE = 25
+# Query parameters of the synchroniser actions, left out of the history page links so they are not repeated.
+SYNC_ACTION_PARAMS = ('start', 'stop', 'trigger', 'clear', 'idx', 'task_id',
+                      'matching_config', 'matching_config_mode', 'force_recompute')
+
 RIGHT_SYNC_VIEW = "csaf.viewSynchronisers_csafmatch"
 RIGHT_SYNC_START = "csaf.startSynchronisers_csafmatch"
 RIGHT_SYNC_STOP = "csaf.stopSynchronisers_csafmatch"
@@ -326,35 +345,20 @@ class Dashboard(View):
         vulnerability_count = models.CsafVulnerability.objects.count()
 
         systems = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'synchronisers', 'urls'), [])
+        matchers = [system for system in systems if getFromJson(system, ('isMatcher',), False)]
         matcher_statuses = []
-        for system in systems:
-            if not getFromJson(system, ('isMatcher',), False):
-                continue
-            name = getFromJson(system, ('name',), 'Unnamed Matcher')
-            token, _ = getSyncToken(request, system)
-            if token is None:
-                matcher_statuses.append({
-                    'name': name,
-                    'state': 'offline',
+        for system, snapshot in zip(matchers, getStatusSnapshots(request, matchers)):
+            if snapshot is TIMED_OUT:
+                matcher_status = {
+                    'name': getFromJson(system, ('name',), 'Unnamed Matcher'),
+                    'state': 'timed out',
                     'running_count': 0,
                     'last_run': None,
-                    'last_run_label': 'Unavailable',
-                })
-                continue
-            status = getStatus(request, system, token) or {}
-            running = status.get('running', [])
-            last_run_ts = status.get('last_matching') or status.get('last_synchronization')
-            matcher_statuses.append({
-                'name': name,
-                'state': status.get('state', 'unknown'),
-                'running_count': len(running),
-                'last_run': datetime.fromtimestamp(last_run_ts) if last_run_ts else None,
-                'last_run_label': (
-                    'Currently running'
-                    if str(status.get('state', '')).lower() == 'running'
-                    else (datetime.fromtimestamp(last_run_ts) if last_run_ts else 'Never')
-                ),
-            })
+                    'last_run_label': 'Timed out',
+                }
+            else:
+                matcher_status = dict(snapshot['matcher'], fetched_at=snapshot['fetched_at'])
+            matcher_statuses.append(matcher_status)
 
         links = {
             'potential_matches': reverse('plugins:csaf:csafmatch_list'),
@@ -385,6 +389,243 @@ class Dashboard(View):
             'links': links,
         })
 
+def getMatcherStatus(name, status):
+    """
+    Summarise the status of a matcher for the dashboard. status is None if the matcher could not be reached.
+    """
+    if status is None:
+        return {
+            'name': name,
+            'state': 'offline',
+            'running_count': 0,
+            'last_run': None,
+            'last_run_label': 'Unavailable',
+        }
+    running = status.get('running') or []
+    last_run_ts = status.get('last_matching') or status.get('last_synchronization')
+    return {
+        'name': name,
+        'state': status.get('state', 'unknown'),
+        'running_count': len(running),
+        'last_run': datetime.fromtimestamp(last_run_ts) if last_run_ts else None,
+        'last_run_label': (
+            'Currently running'
+            if str(status.get('state', '')).lower() == 'running'
+            else (datetime.fromtimestamp(last_run_ts) if last_run_ts else 'Never')
+        ),
+    }
+
+
+def pollSystem(request, system):
+    """
+    Fetch the status of a single synchroniser and build a snapshot for the synchronisers page and the dashboard.
+    request may be None when called from the background poller, errors are only printed then,
+    or a list collecting the errors when called on a worker thread, see gatherForSystems().
+    """
+    name = getFromJson(system, ('name',), 'Unnamed')
+    snapshot = {
+        'fetched_at': timezone.now(),
+        'error_help': False,
+        'matcher': getMatcherStatus(name, None),
+    }
+    (token, msg) = getSyncToken(request, system)
+    snapshot['error_help'] = msg != OK_LABEL
+    if token is None:
+        snapshot['row'] = {
+            'name': name,
+            'lastSync': '-',
+            'state': msg,
+            'started': '-',
+        }
+        return snapshot
+    status = getStatus(request, system, token)
+    if status is None:
+        snapshot['row'] = {
+            'name': name,
+            'lastSync': '-',
+            'state': 'Offline',
+            'started': '-',
+        }
+        return snapshot
+    snapshot['matcher'] = getMatcherStatus(name, status)
+    lastRunStr = status.get('last_matching')
+    lastRunStr = status.get('last_synchronization', lastRunStr)
+    runState = status.get('state', 'Unknown')
+    runStateNormalized = str(runState).strip().lower()
+    startedStr = status.get('start', None)
+    if startedStr is None:
+        started = '-'
+    else:
+        started = datetime.fromtimestamp(startedStr)
+    if lastRunStr is None:
+        lastSync = 'Never or currently running'
+    else:
+        lastSync = datetime.fromtimestamp(lastRunStr)
+    systemData = {
+        'name': name,
+        'lastSync': lastSync,
+        'state': runState,
+        'is_stopped': runStateNormalized == 'stopped',
+        'is_running': runStateNormalized == 'running',
+        'started': started,
+    }
+    isMatcher = getFromJson(system, ('isMatcher',), False)
+    component = infer_component_type(system, is_matcher=isMatcher)
+    systemData['component'] = component
+    systemData['component_label'] = COMPONENT_LABELS.get(component, COMPONENT_LABELS['sync'])
+    systemData['state_badge_class'] = status_badge_class(runState)
+    systemData['metric_cards'] = build_metric_cards_for_status(status, component)
+    if isMatcher:
+        systemData['clear'] = CLEAR_TABLE
+        systemData['info'] = buildInfoStringMatcher(system, status)
+        systemData['matcher_weight_field_groups'] = MATCHER_WEIGHT_FIELD_GROUPS
+        history = syncMatcherHistory(request, system, token)
+        running_tasks = [history['runs'][runId] for runId in history['active']]
+        systemData['running'] = running_tasks
+        systemData['running_summary'] = {
+            'running': sum(1 for item in running_tasks if item['state_key'] == 'running'),
+            'other': sum(1 for item in running_tasks if item['state_key'] != 'running'),
+        }
+    elif 'total_products_fetched' in status:
+        systemData['info'] = buildInfoStringCsafSync(system, status)
+    snapshot['row'] = systemData
+    return snapshot
+
+
+def getHistoryCacheKey(system):
+    url = getFromJson(system, ('url',), '') or ''
+    return 'csaf_history_' + hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def getStoredMatcherHistory(system):
+    return cache.get(getHistoryCacheKey(system)) or {'runs': {}, 'order': [], 'active': [], 'finished': []}
+
+
+def syncMatcherHistory(request, system, token):
+    """
+    Update the locally stored run history of a matcher and return it.
+    The matcher returns its runs newest first, so the history is requested until it reaches the oldest run
+    that was still active, or the newest stored run if none was. Run ids are only compared for equality.
+    The stored history holds the runs by id plus the ids of all, active and finished runs, newest first.
+    """
+    history = getStoredMatcherHistory(system)
+    runs = history['runs']
+    order = history.get('order', [])
+    active = set(history['active'])
+    anchor = next((runId for runId in reversed(order) if runId in active), order[0] if order else None)
+    limit = order.index(anchor) + HISTORY_FETCH_WINDOW if anchor is not None else HISTORY_SEED_LIMIT
+    while True:
+        fetched = [item for item in getMatcherHistory(request, system, token, limit=limit) if item.get('id') is not None]
+        fetchedIds = [item['id'] for item in fetched]
+        # When the anchor is not among the fetched runs, more runs than expected were started in between.
+        if anchor is None or limit >= HISTORY_SEED_LIMIT or len(fetched) < limit or anchor in fetchedIds:
+            break
+        limit = min(limit * 2, HISTORY_SEED_LIMIT)
+    runs.update((item['id'], item) for item in fetched)
+
+    fetchedSet = set(fetchedIds)
+    runIds = list(dict.fromkeys(fetchedIds + [runId for runId in order if runId not in fetchedSet]))
+    runIds = runIds[:HISTORY_SEED_LIMIT]
+    history = {
+        'runs': {runId: runs[runId] for runId in runIds},
+        'order': runIds,
+        'active': [runId for runId in runIds if runs[runId]['state_key'] in ACTIVE_RUN_STATES],
+        'finished': [runId for runId in runIds if runs[runId]['state_key'] not in ACTIVE_RUN_STATES],
+    }
+    cache.set(getHistoryCacheKey(system), history, timeout=None)
+    return history
+
+
+def getPageUrl(request, param, number):
+    """Return the link to another page of a paginated list, keeping the other query parameters."""
+    query = request.GET.copy()
+    for key in SYNC_ACTION_PARAMS:
+        query.pop(key, None)
+    query[param] = number
+    return '?' + query.urlencode()
+
+
+def getMatcherHistoryPage(request, system, idx):
+    """Return the requested page of finished runs of a matcher from the stored history."""
+    history = getStoredMatcherHistory(system)
+    param = f'history_{idx}'
+    paginator = Paginator(history['finished'], HISTORY_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get(param))
+    page.object_list = [history['runs'][runId] for runId in page.object_list]
+    if page.has_previous():
+        page.previous_url = getPageUrl(request, param, page.previous_page_number())
+    if page.has_next():
+        page.next_url = getPageUrl(request, param, page.next_page_number())
+    return page
+
+
+def addPermissionFlags(request, systemData):
+    if request.user.has_perm(RIGHT_SYNC_START):
+        systemData['canStart'] = True
+    if request.user.has_perm(RIGHT_SYNC_STOP):
+        systemData['canStop'] = True
+    if request.user.has_perm(RIGHT_SYNC_CLEAR):
+        systemData['canClear'] = True
+
+
+def getStatusPollInterval():
+    interval = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'synchronisers', 'status_poll_interval_minutes'), 1)
+    try:
+        interval = int(interval)
+    except (TypeError, ValueError):
+        interval = 1
+    return max(interval, 1)
+
+
+def getStatusCacheKey(system):
+    url = getFromJson(system, ('url',), '') or ''
+    return 'csaf_status_' + hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def storeStatusSnapshots(systems, snapshots):
+    # Keep snapshots for two poll intervals, so a missed poll falls back to a live fetch.
+    cache.set_many({
+        getStatusCacheKey(system): snapshot
+        for system, snapshot in zip(systems, snapshots)
+        if snapshot is not TIMED_OUT
+    }, timeout=getStatusPollInterval() * 60 * 2)
+
+
+def getStatusSnapshots(request, systems):
+    """
+    Return the cached status snapshots of the systems, in the order of the systems.
+    Systems without a snapshot are polled live, see gatherForSystems().
+    """
+    keys = [getStatusCacheKey(system) for system in systems]
+    cached = cache.get_many(keys)
+    missing = [system for system, key in zip(systems, keys) if key not in cached]
+    polled = iter([])
+    if missing:
+        snapshots = gatherForSystems(request, missing, pollSystem)
+        storeStatusSnapshots(missing, snapshots)
+        polled = iter(snapshots)
+    return [cached[key] if key in cached else next(polled) for key in keys]
+
+
+def invalidateStatusSnapshot(system):
+    """Drop the snapshot of a system after an action changed its state, so the next page view shows it."""
+    cache.delete(getStatusCacheKey(system))
+
+
+@system_job(interval=getStatusPollInterval())
+class SynchroniserStatusJob(JobRunner):
+    """
+    Refresh the status snapshots of all configured synchronisers in the background,
+    so the synchronisers page and the dashboard do not have to query them on each view.
+    """
+    class Meta:
+        name = "CSAF Synchroniser Status"
+
+    def run(self, *args, **kwargs):
+        systems = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'synchronisers', 'urls'), [])
+        storeStatusSnapshots(systems, gatherForSystems(None, systems, pollSystem))
+
+
 def get_nested(config: dict[str, any], dotted: str) -> any:
     """Liest einen Wert aus dem verschachtelten Dict anhand eines Pfads wie 'Assetsync.Api.port'."""
     parts = dotted.split(".")
@@ -415,95 +656,22 @@ class Synchronisers(View):
             return result
 
         data = []
-        idx = -1;
-        for system in systems:
-            idx += 1
-            name = getFromJson(system, ('name',), 'Unnamed')
-            (token, msg) = getSyncToken(request, system)
-            if msg != OK_LABEL:
-                error_help = True
-            if token is None:
+        for idx, (system, snapshot) in enumerate(zip(systems, getStatusSnapshots(request, systems))):
+            if snapshot is TIMED_OUT:
                 systemData = {
-                    'name': name,
+                    'name': getFromJson(system, ('name',), 'Unnamed'),
                     'lastSync': '-',
-                    'state': msg,
+                    'state': 'Timed out',
                     'started': '-',
-                    'index': idx,
                 }
-                data.append(systemData)
-                continue
-            status = getStatus(request, system, token)
-            if status is None:
-                systemData = {
-                    'name': name,
-                    'lastSync': '-',
-                    'state': 'Offline',
-                    'started': '-',
-                    'index': idx,
-                }
-                data.append(systemData)
-                continue
-            lastRunStr = status.get('last_matching')
-            lastRunStr = status.get('last_synchronization', lastRunStr)
-            runState = status.get('state', 'Unknown')
-            runStateNormalized = str(runState).strip().lower()
-            startedStr = status.get('start', None)
-            if startedStr is None:
-                started = '-'
             else:
-                started = datetime.fromtimestamp(startedStr)
-            if lastRunStr is None:
-                lastSync = 'Never or currently running'
-            else:
-                lastSync = datetime.fromtimestamp(lastRunStr)
-            systemData = {
-                'name': name,
-                'lastSync': lastSync,
-                'state': runState,
-                'is_stopped': runStateNormalized == 'stopped',
-                'is_running': runStateNormalized == 'running',
-                'started': started,
-                'index': idx,
-            }
-            isMatcher = getFromJson(system, ('isMatcher',), False)
-            component = infer_component_type(system, is_matcher=isMatcher)
-            systemData['component'] = component
-            systemData['component_label'] = COMPONENT_LABELS.get(component, COMPONENT_LABELS['sync'])
-            systemData['state_badge_class'] = status_badge_class(runState)
-            systemData['metric_cards'] = build_metric_cards_for_status(status, component)
-            if isMatcher:
-                systemData['clear'] = CLEAR_TABLE
-                systemData['info'] = buildInfoStringMatcher(system, status)
-                systemData['matcher_weight_field_groups'] = MATCHER_WEIGHT_FIELD_GROUPS
-                history = getMatcherHistory(request, system, token, limit=1000)
-                active_run_states = {'running', 'stop_requested', 'stopping', 'stopped'}
-                running_tasks = [
-                    item for item in (history or [])
-                    if str(item.get('state', '')).strip().lower() in active_run_states
-                ]
-                systemData['running'] = running_tasks
-                systemData['running_summary'] = {
-                    'running': sum(
-                        1 for item in running_tasks
-                        if str(item.get('state', '')).strip().lower() == 'running'
-                    ),
-                    'other': sum(
-                        1 for item in running_tasks
-                        if str(item.get('state', '')).strip().lower() != 'running'
-                    ),
-                }
-                systemData['history'] = [
-                    item for item in (history or [])
-                    if str(item.get('state', '')).strip().lower() not in active_run_states
-                ]
-            elif 'total_products_fetched' in status:
-                systemData['info'] = buildInfoStringCsafSync(system, status)
-            if request.user.has_perm(RIGHT_SYNC_START):
-                systemData['canStart'] = True
-            if request.user.has_perm(RIGHT_SYNC_STOP):
-                systemData['canStop'] = True
-            if request.user.has_perm(RIGHT_SYNC_CLEAR):
-                systemData['canClear'] = True
+                systemData = dict(snapshot['row'], fetched_at=snapshot['fetched_at'])
+                error_help = error_help or snapshot['error_help']
+                if 'component' in systemData:
+                    addPermissionFlags(request, systemData)
+                if systemData.get('component') == 'matcher':
+                    systemData['history'] = getMatcherHistoryPage(request, system, idx)
+            systemData['index'] = idx
             data.append(systemData)
         component_order = {'matcher': 0, 'assetsync': 1, 'csafsync': 2, 'sync': 3}
         data.sort(key=lambda row: (component_order.get(row.get('component', 'sync'), 99), row.get('name', '')))
@@ -586,26 +754,31 @@ def queryIsdubaDocuments(query_expression):
     if not base_url:
         return []
 
-    token = getToken()
-    if not token:
-        return []
-
     verify_ssl = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'isduba', 'verify_ssl'), True)
     verify_ssl = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'isduba_verify_ssl'), verify_ssl)
     endpoint = f"{base_url}/api/documents"
-    response = requests.get(
-        endpoint,
-        headers={'authorization': 'Bearer ' + token},
-        params={
-            'query': query_expression,
-            'columns': 'id title tracking_id publisher',
-            'count': '1',
-            'advisories': 'false',
-            'aggregate': 'false',
-        },
-        verify=verify_ssl,
-        timeout=20,
-    )
+    # A cached token might have been revoked, in that case log in again once.
+    for attempt in range(2):
+        token = getToken()
+        if not token:
+            return []
+
+        response = requests.get(
+            endpoint,
+            headers={'authorization': 'Bearer ' + token},
+            params={
+                'query': query_expression,
+                'columns': 'id title tracking_id publisher',
+                'count': '1',
+                'advisories': 'false',
+                'aggregate': 'false',
+            },
+            verify=verify_ssl,
+            timeout=20,
+        )
+        if response.status_code != 401:
+            break
+        invalidateToken(token)
     response.raise_for_status()
     payload = response.json()
 
@@ -866,10 +1039,12 @@ def triggerMatcher(request, system, token):
                 'csaf_documents': csaf_documents,
             }
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
             messages.error(request, f"Failed to start {name}: {response.text}")
         else:
             messages.success(request, f"Triggered {name}")
+            invalidateStatusSnapshot(system)
     except requests.exceptions.RequestException as ex:
         messages.error(request, f"Failed to trigger {name}: {ex}")
 
@@ -1040,10 +1215,12 @@ def startSystem(request, system, token, matchingConfig=None, forceRecompute=None
             startUrl,
             **requestArgs,
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
             messages.error(request, f"Failed to start {name}: {response.text}")
         else:
             messages.success(request, f"Started {name}")
+            invalidateStatusSnapshot(system)
             time.sleep(0.2) # Give the system some time before requesting status
     except requests.exceptions.RequestException as ex:
         messages.error(request, f"Failed to start {name}: {ex}")
@@ -1086,10 +1263,12 @@ def stopSystem(request, system, token):
             headers={'Authorization': 'Bearer ' + token},
             verify=verifySsl,
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
             messages.error(request, f"Failed to stop {name}: {response.text}")
         else:
             messages.success(request, f"Stopped {name}")
+            invalidateStatusSnapshot(system)
             time.sleep(0.2) # Give the system some time before requesting status
     except requests.exceptions.RequestException as ex:
         messages.error(request, f"Failed to stop {name}: {ex}")
@@ -1135,15 +1314,72 @@ def clearSystem(request, system, token, clearType):
             headers={'Authorization': 'Bearer ' + token},
             verify=verifySsl,
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
             messages.error(request, f"Failed to clear {clearType}: {response.text}")
         else:
             messages.success(request, f"Cleared {clearType}")
+            invalidateStatusSnapshot(system)
+            cache.delete(getHistoryCacheKey(system))
             time.sleep(0.2) # Give the system some time before requesting status
     except requests.exceptions.RequestException as ex:
         messages.error(request, f"Failed to clear {clearType}: {ex}")
 
 
+def reportError(request, message):
+    """
+    Show an error to the user, or print it if there is no request (background jobs).
+    Worker threads pass a list instead of the request, the collected errors are shown by gatherForSystems().
+    """
+    if request is None:
+        print(message)
+    elif isinstance(request, list):
+        request.append(message)
+    else:
+        messages.error(request, message)
+
+
+def getStatusTimeout():
+    timeout = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'synchronisers', 'status_timeout_seconds'), 10)
+    try:
+        timeout = float(timeout)
+    except (TypeError, ValueError):
+        timeout = 10
+    return max(timeout, 1)
+
+
+def gatherForSystems(request, systems, func):
+    """
+    Call func(errors, system) for all systems concurrently and return the results in the order of the systems.
+    func runs on a worker thread and must not use the request, it reports errors by reportError(errors, ...).
+    The errors of the systems that delivered a result are reported for the request on the calling thread.
+    Systems that do not deliver a result within the status timeout get TIMED_OUT as result, their late
+    results and errors are ignored, so a single slow or offline system does not stall the page.
+    """
+    results = [TIMED_OUT] * len(systems)
+    if not systems:
+        return results
+    executor = ThreadPoolExecutor(max_workers=len(systems))
+    futures = {}
+    for idx, system in enumerate(systems):
+        errors = []
+        futures[executor.submit(func, errors, system)] = (idx, errors)
+    try:
+        for future in as_completed(futures, timeout=getStatusTimeout()):
+            idx, errors = futures[future]
+            for message in errors:
+                reportError(request, message)
+            results[idx] = future.result()
+    except FuturesTimeoutError:
+        late = [future for future in futures if not future.done()]
+        for future in late:
+            future.cancel()
+        print(f"Timed out waiting for {len(late)} synchronisers, ignoring their results")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
 def getStatus(request, system, token):
     verifySsl = getFromJson(settings.PLUGINS_CONFIG, ('csaf','synchronisers','verify_ssl'), True)
     verifySsl = getFromJson(system, ('verify_ssl'), verifySsl)
@@ -1155,16 +1391,18 @@ def getStatus(request, system, token):
             status_url,
             headers={'Authorization': 'Bearer ' + token},
             verify=verifySsl,
+            timeout=getStatusTimeout(),
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
-            messages.error(request, f"Failed to fetch status of {name}: {response.text}")
+            reportError(request, f"Failed to fetch status of {name}: {response.text}")
         result = response.json()
         isMatcher = getFromJson(system, ('isMatcher',), False)
         if isMatcher:
             result['running'] = getRunningMatchers(request, system, token)
         return result
     except requests.exceptions.RequestException as ex:
-        messages.error(request, f"Failed to fetch status of {name}: {ex}")
+        reportError(request, f"Failed to fetch status of {name}: {ex}")
 
 def getConfig(request, system, token):
     verifySsl = getFromJson(settings.PLUGINS_CONFIG, ('csaf','synchronisers','verify_ssl'), True)
@@ -1177,7 +1415,9 @@ def getConfig(request, system, token):
             status_url,
             headers={'Authorization': 'Bearer ' + token},
             verify=verifySsl,
+            timeout=getStatusTimeout(),
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
             messages.error(request, f"Failed to fetch config of {name}: {response.text}")
         result = response.json()
@@ -1198,6 +1438,7 @@ def setConfig(request, system, token, config):
             verify=verifySsl,
             json=config
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
             messages.error(request, f"Failed to save config of {name}: {response.text}")
         result = response.json()
@@ -1218,9 +1459,11 @@ def getRunningMatchers(request, system, token):
             status_url,
             headers={'Authorization': 'Bearer ' + token},
             verify=verifySsl,
+            timeout=getStatusTimeout(),
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
-            messages.error(request, f"Failed to fetch running tasks of {name}: {response.text}")
+            reportError(request, f"Failed to fetch running tasks of {name}: {response.text}")
         result = response.json()
         for item in result:
             item['start_time'] = datetime.fromtimestamp(item['start_time'])
@@ -1237,7 +1480,7 @@ def getRunningMatchers(request, system, token):
                 item['progress_pct'] = int(max(0, min(100, round(progress * 100))))
         return result
     except requests.exceptions.RequestException as ex:
-        messages.error(request, f"Failed to fetch running tasks of {name}: {ex}")
+        reportError(request, f"Failed to fetch running tasks of {name}: {ex}")
 
 
 def getMatcherHistory(request, system, token, limit=1000):
@@ -1252,10 +1495,12 @@ def getMatcherHistory(request, system, token, limit=1000):
             history_url,
             headers={'Authorization': 'Bearer ' + token},
             verify=verifySsl,
+            timeout=getStatusTimeout(),
             params={'limit': limit},
         )
+        invalidateSyncTokenOn401(system, token, response)
         if (response.status_code < 200 or response.status_code >= 300):
-            messages.error(request, f"Failed to fetch run history of {name}: {response.text}")
+            reportError(request, f"Failed to fetch run history of {name}: {response.text}")
             return []
 
         result = response.json()
@@ -1267,6 +1512,7 @@ def getMatcherHistory(request, system, token, limit=1000):
             if finished is not None:
                 item['finished_at'] = datetime.fromtimestamp(finished)
 
+            item['state_key'] = str(item.get('state', '')).strip().lower()
             trigger = str(item.get('trigger', '')).strip().lower()
             if trigger == 'manual':
                 item['trigger_label'] = 'Manual'
@@ -1291,12 +1537,12 @@ def getMatcherHistory(request, system, token, limit=1000):
                 item['progress_pct'] = int(max(0, min(100, round(progress * 100))))
         return result
     except requests.exceptions.RequestException as ex:
-        messages.error(request, f"Failed to fetch run history of {name}: {ex}")
+        reportError(request, f"Failed to fetch run history of {name}: {ex}")
         return []
 
 
 def getSyncToken(request, subsystem) -> str:
-    """Retrieve an access token via Keycloak."""
+    """Retrieve an access token from a synchroniser, reusing the cached one while it is valid."""
 
     verifySsl = getFromJson(settings.PLUGINS_CONFIG, ('csaf','synchronisers','verify_ssl'), True)
     username = getFromJson(settings.PLUGINS_CONFIG, ('csaf','synchronisers','username'), None)
@@ -1310,25 +1556,46 @@ def getSyncToken(request, subsystem) -> str:
 
     baseUrl = baseUrl.removesuffix('/')
     token_url = f"{baseUrl}/token"
-    try:
-        response = requests.post(
-            token_url,
-            data={
-                'username': username,
-                'password': password,
-            },
-            verify=verifySsl,
-        )
-        if (response.status_code < 200 or response.status_code >= 300):
-            messages.error(request, f"Failed to login to {name}: {response.text}")
-            return None,'Login Failed'
-        return response.json().get('access_token'), OK_LABEL
-    except requests.exceptions.ConnectionError as ex:
-        messages.error(request, f"Failed to connect to {name} at {baseUrl}: {ex.__context__.__cause__._message}")
-        return None,'Connection failed'
-    except requests.exceptions.RequestException as ex:
-        messages.error(request, f"Failed to login to {name}: {ex}")
-        return None,'Unknown error'
+    msg = OK_LABEL
+
+    def login():
+        nonlocal msg
+        try:
+            response = requests.post(
+                token_url,
+                data={
+                    'username': username,
+                    'password': password,
+                },
+                verify=verifySsl,
+                timeout=getStatusTimeout(),
+            )
+            if (response.status_code < 200 or response.status_code >= 300):
+                reportError(request, f"Failed to login to {name}: {response.text}")
+                msg = 'Login Failed'
+                return None
+            return response.json()
+        except requests.exceptions.ConnectionError as ex:
+            reportError(request, f"Failed to connect to {name} at {baseUrl}: {ex.__context__.__cause__._message}")
+            msg = 'Connection failed'
+        except requests.exceptions.RequestException as ex:
+            reportError(request, f"Failed to login to {name}: {ex}")
+            msg = 'Unknown error'
+
+    return tokenCache.get(getSyncTokenKey(subsystem), login), msg
+
+
+def getSyncTokenKey(subsystem):
+    username = getFromJson(settings.PLUGINS_CONFIG, ('csaf','synchronisers','username'), None)
+    username = getFromJson(subsystem, ('username',), username)
+    baseUrl = getFromJson(subsystem, ('url',), '').removesuffix('/')
+    return ('sync', baseUrl, username)
+
+
+def invalidateSyncTokenOn401(system, token, response):
+    """Drop a cached synchroniser token that the synchroniser no longer accepts."""
+    if response.status_code == 401:
+        tokenCache.invalidate(getSyncTokenKey(system), token)
 
 
 @register_model_view(models.CsafDocument)
@@ -1349,40 +1616,7 @@ class CsafDocumentView(generic.ObjectView):
 @register_model_view(models.CsafDocument, name='list', path='', detail=False)
 class CsafDocumentListView(generic.ObjectListView):
     """ This view handles the request for displaying multiple CsafDocuments as a table. """
-    queryset = models.CsafDocument.objects.annotate(
-            new_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'csaf_document': OuterRef('pk')})
-                    .filter(acceptance_status__in=[
-                        models.CsafMatch.AcceptanceStatus.NEW,
-                        models.CsafMatch.AcceptanceStatus.REOPENED])
-                    .values('csaf_document')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            confirmed_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'csaf_document': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-                    .values('csaf_document')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            resolved_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'csaf_document': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE)
-                    .values('csaf_document')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            total_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'csaf_document': OuterRef('pk')})
-                    .values('csaf_document')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        )
+    queryset = models.CsafDocument.objects.defer(*models.DOCUMENT_CONTENT_FIELDS)
     table = tables.CsafDocumentTable
     template_name = 'csaf/csafdocument_list.html'
     filterset = filtersets.CsafDocumentFilterSet
@@ -1424,7 +1658,7 @@ class CsafMatchView(generic.ObjectView):
         'module',
         'software',
         'csaf_document',
-    ).prefetch_related('csaf_document__vulnerabilities', 'vulnerability_statuses__vulnerability')
+    ).prefetch_related('vulnerability_statuses__vulnerability').defer(*models.MATCH_DEFERRED_DOCUMENT_FIELDS)
 
     def post(self, request, **kwargs):
         instance = self.get_object(**kwargs)
@@ -1499,7 +1733,7 @@ class CsafMatchBulkDeleteView(generic.BulkDeleteView):
         'device',
         'software',
         'csaf_document',
-    ).prefetch_related('csaf_document__vulnerabilities')
+    ).defer(*models.MATCH_DEFERRED_DOCUMENT_FIELDS)
     filterset = filtersets.CsafMatchFilterSet
     table = tables.CsafMatchTable
 
@@ -1546,6 +1780,24 @@ class CsafVulnerabilityBulkDeleteView(generic.BulkDeleteView):
     table = tables.CsafVulnerabilityTable
 
 
+@register_model_view(models.CsafProduct)
+class CsafProductView(generic.ObjectView):
+    """ This view handles the request for displaying a CsafProduct. """
+    queryset = models.CsafProduct.objects.all()
+
+
+@register_model_view(models.CsafProduct, name='list', path='', detail=False)
+class CsafProductListView(generic.ObjectListView):
+    """ This view handles the request for displaying multiple CsafProducts as a table. """
+    queryset = models.CsafProduct.objects.all()
+    table = tables.CsafProductTable
+    filterset = filtersets.CsafProductFilterSet
+    filterset_form = forms.CsafProductFilterForm
+    actions = {
+        'export': {'view'},
+    }
+
+
 # CsafMatches view for New/Reopened Matches
 @register_model_view(models.CsafMatch, name='list', path='', detail=False)
 class CsafMatchListView(generic.ObjectListView, GetReturnURLMixin):
@@ -1556,7 +1808,7 @@ class CsafMatchListView(generic.ObjectListView, GetReturnURLMixin):
         'module',
         'software',
         'csaf_document',
-    ).prefetch_related('csaf_document__vulnerabilities', 'vulnerability_statuses')
+    ).prefetch_related('vulnerability_statuses').defer(*models.MATCH_DEFERRED_DOCUMENT_FIELDS)
     filterset = filtersets.CsafMatchFilterSet
     filterset_form = forms.CsafMatchFilterForm
     table = tables.CsafMatchTable
@@ -1710,18 +1962,7 @@ class CsafMatchListView(generic.ObjectListView, GetReturnURLMixin):
             selected_objects = selected_objects.filter(
                 pk__in=request.POST.getlist('pk'),
             )
-            with transaction.atomic():
-                count = 0
-                skipped = 0
-                for csafMatch in selected_objects.select_related('csaf_document'):
-                    if csafMatch.acceptance_status != models.CsafMatch.AcceptanceStatus.CONFIRMED:
-                        skipped += 1
-                        continue
-                    csafMatch.set_all_vulnerability_remediations(targetRemStatus)
-                    count += 1
-            messages.success(request, f"Updated {count} CSAF-Matches")
-            if skipped:
-                messages.warning(request, f"Skipped {skipped} non-confirmed CSAF-Matches.")
+            setRemediationStatusFor(selected_objects, targetRemStatus, request)
         if redirect_to_confirmed:
             return redirect('plugins:csaf:csafmatch_confirmed')
         if redirect_to_potential:
@@ -1738,57 +1979,147 @@ def setAcceptedStatusFor(queryset, matchId, targetStatus, request):
         selected_objects = queryset.filter(
             pk__in=matchId,
         )
+    matchIds = list(selected_objects.values_list('pk', flat=True))
+    if len(matchIds) > getBulkJobThreshold():
+        enqueueBulkAction(request, matchIds, BULK_ACTION_ACCEPTANCE, targetStatus)
+        return
     with transaction.atomic():
-        count = 0
-        for csafMatch in selected_objects:
-            csafMatch.acceptance_status = targetStatus
-            csafMatch.save()
-            count += 1
-            # ToDo: Add config check if findings need to be created
-            if targetStatus == models.CsafMatch.AcceptanceStatus.CONFIRMED:
-                csafMatch.sync_vulnerability_remediations()
-                doc = csafMatch.csaf_document
-                data = gatherProductInfoFromDoc(doc, csafMatch.product_name_id)
-                createFindingsFromData(csafMatch, data)
+        count = applyAcceptedStatus(
+            models.CsafMatch.objects.filter(pk__in=matchIds),
+            targetStatus,
+            request.user,
+            getattr(request, 'id', None),
+        )
     messages.success(request, f"Updated {count} CSAF-Matches")
 
 
-def createFindingsFromData(match, data):
-    # ToDo: Create finding
-    pass
+def setRemediationStatusFor(selected_objects, targetStatus, request):
+    matchIds = list(selected_objects.values_list('pk', flat=True))
+    if len(matchIds) > getBulkJobThreshold():
+        enqueueBulkAction(request, matchIds, BULK_ACTION_REMEDIATION, targetStatus)
+        return
+    with transaction.atomic():
+        count, skipped = applyRemediationStatus(models.CsafMatch.objects.filter(pk__in=matchIds), targetStatus)
+    messages.success(request, f"Updated {count} CSAF-Matches")
+    if skipped:
+        messages.warning(request, f"Skipped {skipped} non-confirmed CSAF-Matches.")
 
 
-def gatherProductInfoFromDoc(doc, productNameId):
-    if not doc.product_tree:
-        return None
-    for branch in doc.product_tree.get('branches', []):
-        found, data = gatherProductInfoFromBranch(branch, productNameId)
-        if found:
-            return data
-    return {}
+def applyAcceptedStatus(selected_objects, targetStatus, user, requestId):
+    """
+    Set the acceptance status of the selected matches and return their number, to be called in a transaction.
+    """
+    matches = list(selected_objects.prefetch_related('tags'))
+    changed = [csafMatch for csafMatch in matches if csafMatch.acceptance_status != targetStatus]
+    timestamp = timezone.now()
+    for csafMatch in changed:
+        csafMatch.snapshot()
+        csafMatch.acceptance_status = targetStatus
+        csafMatch.last_updated = timestamp
+    changedMatches = models.CsafMatch.objects.filter(pk__in=[csafMatch.pk for csafMatch in changed])
+    changedMatches.update(acceptance_status=targetStatus, last_updated=timestamp)
+    logMatchChanges(changed, user, requestId)
+    # The UPDATE bypasses the signal handlers, so the derived counters are refreshed here.
+    models.CsafDocument.objects.filter(
+        pk__in={csafMatch.csaf_document_id for csafMatch in changed},
+    ).refresh_match_counts()
+    models.CsafAssetSummary.objects.refresh_for_matches(changedMatches)
+
+    # ToDo: Add config check if findings need to be created
+    if targetStatus == models.CsafMatch.AcceptanceStatus.CONFIRMED:
+        models.CsafMatch.objects.filter(
+            pk__in=[csafMatch.pk for csafMatch in matches],
+        ).sync_vulnerability_remediations()
+        # The product index of each document is loaded once, however many of its matches are confirmed.
+        productIndexes = {
+            doc.pk: doc.product_index
+            for doc in models.CsafDocument.objects.filter(
+                pk__in={csafMatch.csaf_document_id for csafMatch in matches},
+            ).only('id', 'product_index')
+        }
+        for csafMatch in matches:
+            productIndex = productIndexes.get(csafMatch.csaf_document_id)
+            if productIndex is None:
+                data = None
+            else:
+                data = productIndex.get((csafMatch.product_name_id or '').strip(), {}).get('info', {})
+            createFindingsFromData(csafMatch, data)
+    return len(matches)
+
+
+def applyRemediationStatus(selected_objects, targetStatus):
+    """
+    Set the remediation status of all vulnerabilities of the selected confirmed matches, to be called in a transaction.
+    Returns the number of updated and of skipped, non-confirmed matches.
+    """
+    total = selected_objects.count()
+    count = selected_objects.set_vulnerability_remediations(targetStatus)
+    return count, total - count
+
+
+def getBulkJobThreshold():
+    threshold = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'matches', 'bulk_job_threshold'), 500)
+    try:
+        threshold = int(threshold)
+    except (TypeError, ValueError):
+        threshold = 500
+    return max(threshold, 0)
 
 
-def gatherProductInfoFromBranch(branch, productNameId):
-    if getFromJson(branch, ('product', 'product_id', ), None) == productNameId:
-        data = {}
-        addDataFromBranch(branch.get('product'), data)
-        addDataFromBranch(branch, data)
-        return True, data
-    for sub in branch.get('branches', []):
-        found, data = gatherProductInfoFromBranch(sub, productNameId)
-        if found:
-            addDataFromBranch(branch, data)
-            return found, data
-    return False, {}
+def getBulkChunkSize():
+    chunkSize = getFromJson(settings.PLUGINS_CONFIG, ('csaf', 'matches', 'bulk_chunk_size'), 500)
+    try:
+        chunkSize = int(chunkSize)
+    except (TypeError, ValueError):
+        chunkSize = 500
+    return max(chunkSize, 1)
+
+
+def enqueueBulkAction(request, matchIds, action, targetStatus):
+    job = CsafMatchBulkActionJob.enqueue(
+        user=request.user,
+        matchIds=matchIds,
+        action=action,
+        targetStatus=targetStatus,
+    )
+    messages.info(request, format_html(
+        'Updating {} CSAF-Matches in the background, see <a href="{}">{}</a>.',
+        len(matchIds),
+        job.get_absolute_url(),
+        job,
+    ))
 
 
-def addDataFromBranch(branch, data):
-    if branch.get('category'):
-        category = branch.get('category', None)
-        if category and not data.get(category):
-            data[category] = branch.get('name')
-    if branch.get('product_id'):
-        data['product_name'] = branch.get('name')
+class CsafMatchBulkActionJob(JobRunner):
+    """
+    Apply an acceptance or remediation status to a large selection of matches in the background.
+    The matches are processed in chunks that are committed one by one, the progress is kept in the job data.
+    """
+    class Meta:
+        name = "CSAF Match Bulk Action"
+
+    def run(self, matchIds, action, targetStatus, *args, **kwargs):
+        chunkSize = getBulkChunkSize()
+        progress = {'total': len(matchIds), 'processed': 0, 'updated': 0, 'skipped': 0}
+        for start in range(0, len(matchIds), chunkSize):
+            chunkIds = matchIds[start:start + chunkSize]
+            selected_objects = models.CsafMatch.objects.filter(pk__in=chunkIds)
+            with transaction.atomic():
+                if action == BULK_ACTION_ACCEPTANCE:
+                    updated = applyAcceptedStatus(selected_objects, targetStatus, self.job.user, self.job.job_id)
+                    skipped = 0
+                else:
+                    updated, skipped = applyRemediationStatus(selected_objects, targetStatus)
+            progress['processed'] += len(chunkIds)
+            progress['updated'] += updated
+            progress['skipped'] += skipped
+            self.job.data = dict(progress)
+            self.job.save(update_fields=['data'])
+
+
+def createFindingsFromData(match, data):
+    # ToDo: Create finding
+    pass
 
 
 # CsafMatches view for New/Reopened Matches
@@ -1831,7 +2162,7 @@ class CsafMatchListFor(generic.ObjectChildrenView, GetReturnURLMixin):
             'module',
             'software',
             'csaf_document',
-        ).prefetch_related('csaf_document__vulnerabilities', 'vulnerability_statuses')
+        ).prefetch_related('vulnerability_statuses').defer(*models.MATCH_DEFERRED_DOCUMENT_FIELDS)
 
     def get_confirmed_tab_url(self, instance):
         base = instance.get_absolute_url()
@@ -1895,18 +2226,7 @@ class CsafMatchListFor(generic.ObjectChildrenView, GetReturnURLMixin):
             selected_objects = children.filter(
                 pk__in=request.POST.getlist('pk'),
             )
-            with transaction.atomic():
-                count = 0
-                skipped = 0
-                for csafMatch in selected_objects.select_related('csaf_document'):
-                    if csafMatch.acceptance_status != models.CsafMatch.AcceptanceStatus.CONFIRMED:
-                        skipped += 1
-                        continue
-                    csafMatch.set_all_vulnerability_remediations(targetRemStatus)
-                    count += 1
-            messages.success(request, f"Updated {count} CSAF-Matches")
-            if skipped:
-                messages.warning(request, f"Skipped {skipped} non-confirmed CSAF-Matches.")
+            setRemediationStatusFor(selected_objects, targetRemStatus, request)
         if redirect_to_confirmed:
             return redirect(self.get_confirmed_tab_url(instance))
         if redirect_to_potential:
@@ -1978,84 +2298,13 @@ def cleanUrl(url):
     return result
 
 
-def extract_csaf_products(product_tree):
-    products = []
-    known_branch_categories = {
-        'architecture',
-        'host_name',
-        'language',
-        'legacy',
-        'patch_level',
-        'product_family',
-        'product_name',
-        'product_version',
-        'product_version_range',
-        'service_pack',
-        'specification',
-        'vendor',
-    }
-
-    def walk(node, path, lineage):
-        if isinstance(node, dict):
-            category = node.get('category')
-            name = node.get('name')
-            include_in_lineage = category in known_branch_categories and isinstance(name, str) and bool(name.strip())
-            current_path = path + ([name] if include_in_lineage else [])
-            current_lineage = lineage + ([{'category': category, 'name': name}] if include_in_lineage else [])
-
-            product = node.get('product')
-            if isinstance(product, dict):
-                entry = dict(product)
-                entry['_branch_category'] = category
-                entry['_branch_name'] = name
-                if current_path:
-                    entry['path'] = current_path
-                if current_lineage:
-                    entry['_lineage'] = current_lineage
-                products.append(entry)
-
-            full_product_names = node.get('full_product_names')
-            if isinstance(full_product_names, list):
-                for item in full_product_names:
-                    if isinstance(item, dict):
-                        entry = dict(item)
-                        entry['_branch_category'] = category
-                        entry['_branch_name'] = name
-                        if current_path:
-                            entry['path'] = current_path
-                        if current_lineage:
-                            entry['_lineage'] = current_lineage
-                        products.append(entry)
-
-            if 'product_id' in node and 'name' in node and category in known_branch_categories:
-                entry = dict(node)
-                entry['_branch_category'] = category
-                entry['_branch_name'] = name
-                if current_path:
-                    entry['path'] = current_path
-                if current_lineage:
-                    entry['_lineage'] = current_lineage
-                products.append(entry)
-
-            for branch in node.get('branches', []) or []:
-                walk(branch, current_path, current_lineage)
-        elif isinstance(node, list):
-            for item in node:
-                walk(item, path, lineage)
-
-    walk(product_tree or {}, [], [])
-    return products
-
-
 def get_product_for_match(match):
     target_product_id = (match.product_name_id or '').strip()
     if not target_product_id:
         return None
 
-    for product in extract_csaf_products(match.csaf_document.product_tree):
-        if str(product.get('product_id', '')).strip() == target_product_id:
-            return product
-    return None
+    entry = (match.csaf_document.product_index or {}).get(target_product_id)
+    return entry['product'] if entry else None
 
 
 def get_type_version_value(type_obj):
@@ -2417,7 +2666,7 @@ class CsafMatchComparisonView(generic.ObjectView):
         'software',
         'software__manufacturer',
         'csaf_document',
-    )
+    ).defer('csaf_document__product_tree')
     template_name = 'csaf/csafmatch_comparison.html'
 
     def render_comparison_page(self, request, instance, transfer_edit_field='', transfer_edit_value=''):
@@ -2535,12 +2784,7 @@ class CsafNewMatchListForDeviceView(CsafMatchListFor):
 
     tab = ViewTab(
         label='Potential CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            device=obj,
-            acceptance_status__in=[
-                models.CsafMatch.AcceptanceStatus.NEW,
-                models.CsafMatch.AcceptanceStatus.REOPENED])
-            .count(),
+        badge=lambda obj: new_match_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
@@ -2567,11 +2811,7 @@ class CsafConfirmedMatchListForDeviceView(CsafMatchListFor):
 
     tab = ViewTab(
         label='CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            device=obj,
-            acceptance_status__in=[
-                models.CsafMatch.AcceptanceStatus.CONFIRMED])
-            .count(),
+        badge=lambda obj: confirmed_match_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
@@ -2595,12 +2835,7 @@ class CsafNewMatchListForModuleView(CsafMatchListFor):
 
     tab = ViewTab(
         label='Potential CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            module=obj,
-            acceptance_status__in=[
-                models.CsafMatch.AcceptanceStatus.NEW,
-                models.CsafMatch.AcceptanceStatus.REOPENED])
-            .count(),
+        badge=lambda obj: new_match_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
@@ -2627,10 +2862,7 @@ class CsafMatchListForModuleView(CsafMatchListFor):
 
     tab = ViewTab(
         label='CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            module=obj,
-            acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-            .count(),
+        badge=lambda obj: confirmed_match_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
@@ -2655,22 +2887,8 @@ class CsafNewMatchListForCsafDocumentView(CsafMatchListFor):
     tab = ViewTab(
         label='Potential CSAF Matches',
         badge=lambda obj: (
-            lambda new_count, reopened_count, false_positives:
-                f"{new_count + reopened_count} | R:{reopened_count}"
-                + (f" | FP:{false_positives}" if false_positives else "")
-        )(
-            models.CsafMatch.objects.filter(
-                csaf_document=obj,
-                acceptance_status=models.CsafMatch.AcceptanceStatus.NEW,
-            ).count(),
-            models.CsafMatch.objects.filter(
-                csaf_document=obj,
-                acceptance_status=models.CsafMatch.AcceptanceStatus.REOPENED,
-            ).count(),
-            models.CsafMatch.objects.filter(
-                csaf_document=obj,
-                acceptance_status=models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE,
-            ).count(),
+            f"{obj.match_statistics['new'] + obj.match_statistics['reopened']} | R:{obj.match_statistics['reopened']}"
+            + (f" | FP:{obj.match_statistics['false_positive']}" if obj.match_statistics['false_positive'] else "")
         ),
         permission='csaf.view_csafmatch'
     )
@@ -2700,12 +2918,8 @@ class CsafNewMatchListForCsafDocumentView(CsafMatchListFor):
             )
 
     def get_extra_context(self, request, instance):
-        false_positive_count = self.child_model.objects.filter(
-            csaf_document=instance,
-            acceptance_status=models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE,
-        ).count()
         return {
-            'false_positive_count': false_positive_count,
+            'false_positive_count': instance.match_statistics['false_positive'],
             'include_false_positives': getattr(self, 'include_false_positives', False),
         }
 
@@ -2722,10 +2936,7 @@ class CsafMatchListForCsafDocumentView(CsafMatchListFor):
 
     tab = ViewTab(
         label='CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            csaf_document=obj,
-            acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-            .count(),
+        badge=lambda obj: obj.match_statistics['confirmed'],
         permission='csaf.view_csafmatch'
     )
 
@@ -2758,6 +2969,30 @@ class CsafVulnerabilityListForCsafDocumentView(generic.ObjectChildrenView):
         return self.child_model.objects.filter(csaf_document=parent)
 
 
+# CsafProducts view for one Document
+@register_model_view(model=models.CsafDocument, name='productlistforcsafdocument', path='products', )
+class CsafProductListForCsafDocumentView(generic.ObjectChildrenView):
+    """ Handles the request of displaying the products of a CsafDocument. """
+    additional_permissions = ('csaf.view_csafproduct',)
+    queryset = models.CsafDocument.objects.all()
+    child_model = models.CsafProduct
+    table = tables.CsafProductTable
+    filterset = filtersets.CsafProductFilterSet
+    filterset_form = forms.CsafProductFilterForm
+    actions = {
+        'export': {'view'},
+    }
+
+    tab = ViewTab(
+        label='Products',
+        badge=lambda obj: models.CsafProduct.objects.filter(csaf_document=obj).count(),
+        permission='csaf.view_csafproduct'
+    )
+
+    def get_children(self, request, parent):
+        return self.child_model.objects.filter(csaf_document=parent)
+
+
 # New CsafMatches view for one Software
 @register_model_view(model=Software, name='newmatchlistforsoftware', path='csafmatchesnew', )
 class CsafMatchListForSoftwareView(CsafMatchListFor):
@@ -2770,12 +3005,7 @@ class CsafMatchListForSoftwareView(CsafMatchListFor):
 
     tab = ViewTab(
         label='Potential CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            software=obj,
-            acceptance_status__in=[
-                models.CsafMatch.AcceptanceStatus.NEW,
-                models.CsafMatch.AcceptanceStatus.REOPENED])
-            .count(),
+        badge=lambda obj: new_match_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
@@ -2802,10 +3032,7 @@ class CsafMatchListForSoftwareView(CsafMatchListFor):
 
     tab = ViewTab(
         label='CSAF Matches',
-        badge=lambda obj: models.CsafMatch.objects.filter(
-            software=obj,
-            acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-            .count(),
+        badge=lambda obj: confirmed_match_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
@@ -2941,24 +3168,25 @@ class CsafVulnerabilityListForAsset(generic.ObjectChildrenView, GetReturnURLMixi
         return redirect(return_url)
 
 
-def vulnerability_tab_badge_for(**asset_filter):
-    counts = models.CsafMatchVulnerabilityRemediation.objects.filter(
-        match__acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED,
-        **asset_filter,
-    ).aggregate(
-        not_started=Count(
-            'id',
-            filter=Q(remediation_status=models.CsafMatch.RemediationStatus.NEW),
-        ),
-        in_progress=Count(
-            'id',
-            filter=Q(remediation_status=models.CsafMatch.RemediationStatus.IN_PROGRESS),
-        ),
-        complete=Count(
-            'id',
-            filter=Q(remediation_status=models.CsafMatch.RemediationStatus.RESOLVED),
-        ),
-    )
+def new_match_badge_for(asset):
+    summary = models.CsafAssetSummary.for_asset(asset)
+    return summary.new_match_count + summary.reopened_match_count if summary else 0
+
+
+def confirmed_match_badge_for(asset):
+    summary = models.CsafAssetSummary.for_asset(asset)
+    return summary.confirmed_match_count if summary else 0
+
+
+def vulnerability_tab_badge_for(asset):
+    summary = models.CsafAssetSummary.for_asset(asset)
+    if summary is None:
+        return ""
+    counts = {
+        'not_started': summary.open_vulnerability_count,
+        'in_progress': summary.in_progress_vulnerability_count,
+        'complete': summary.resolved_vulnerability_count,
+    }
     parts = []
     if counts['not_started']:
         parts.append(f"🔴{counts['not_started']}")
@@ -2978,17 +3206,16 @@ class CsafVulnerabilityListForDeviceView(CsafVulnerabilityListForAsset):
 
     tab = ViewTab(
         label='Vulnerabilities',
-        badge=lambda obj: vulnerability_tab_badge_for(match__device=obj),
+        badge=lambda obj: vulnerability_tab_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
     def get_children_for(self, parent):
-        confirmed_matches = models.CsafMatch.objects.filter(
+        # Remediation entries are synced when they are written, only matches changed since are synced here.
+        models.CsafMatch.objects.filter(
             device=parent,
             acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED,
-        ).select_related('csaf_document').prefetch_related('csaf_document__vulnerabilities')
-        for match in confirmed_matches:
-            match.sync_vulnerability_remediations()
+        ).sync_dirty_vulnerability_remediations()
 
         return self.child_model.objects.filter(
             match__device=parent,
@@ -3000,7 +3227,7 @@ class CsafVulnerabilityListForDeviceView(CsafVulnerabilityListForAsset):
             'match__device',
             'match__module',
             'match__software',
-        )
+        ).defer(*(f'match__{field}' for field in models.MATCH_DEFERRED_DOCUMENT_FIELDS))
 
 
 @register_model_view(Module, name='vulnerabilitylistformodule', path='csafvulnerabilities')
@@ -3012,17 +3239,16 @@ class CsafVulnerabilityListForModuleView(CsafVulnerabilityListForAsset):
 
     tab = ViewTab(
         label='Vulnerabilities',
-        badge=lambda obj: vulnerability_tab_badge_for(match__module=obj),
+        badge=lambda obj: vulnerability_tab_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
     def get_children_for(self, parent):
-        confirmed_matches = models.CsafMatch.objects.filter(
+        # Remediation entries are synced when they are written, only matches changed since are synced here.
+        models.CsafMatch.objects.filter(
             module=parent,
             acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED,
-        ).select_related('csaf_document').prefetch_related('csaf_document__vulnerabilities')
-        for match in confirmed_matches:
-            match.sync_vulnerability_remediations()
+        ).sync_dirty_vulnerability_remediations()
 
         return self.child_model.objects.filter(
             match__module=parent,
@@ -3034,7 +3260,7 @@ class CsafVulnerabilityListForModuleView(CsafVulnerabilityListForAsset):
             'match__device',
             'match__module',
             'match__software',
-        )
+        ).defer(*(f'match__{field}' for field in models.MATCH_DEFERRED_DOCUMENT_FIELDS))
 
 
 @register_model_view(Software, name='vulnerabilitylistforsoftware', path='csafvulnerabilities')
@@ -3046,17 +3272,16 @@ class CsafVulnerabilityListForSoftwareView(CsafVulnerabilityListForAsset):
 
     tab = ViewTab(
         label='Vulnerabilities',
-        badge=lambda obj: vulnerability_tab_badge_for(match__software=obj),
+        badge=lambda obj: vulnerability_tab_badge_for(obj),
         permission='csaf.view_csafmatch'
     )
 
     def get_children_for(self, parent):
-        confirmed_matches = models.CsafMatch.objects.filter(
+        # Remediation entries are synced when they are written, only matches changed since are synced here.
+        models.CsafMatch.objects.filter(
             software=parent,
             acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED,
-        ).select_related('csaf_document').prefetch_related('csaf_document__vulnerabilities')
-        for match in confirmed_matches:
-            match.sync_vulnerability_remediations()
+        ).sync_dirty_vulnerability_remediations()
 
         return self.child_model.objects.filter(
             match__software=parent,
@@ -3068,7 +3293,7 @@ class CsafVulnerabilityListForSoftwareView(CsafVulnerabilityListForAsset):
             'match__device',
             'match__module',
             'match__software',
-        )
+        ).defer(*(f'match__{field}' for field in models.MATCH_DEFERRED_DOCUMENT_FIELDS))
 
 
 def handleStatus(request, enumCls=models.CsafMatch.AcceptanceStatus, deflt='1110'):
@@ -3092,43 +3317,28 @@ def handleStatus(request, enumCls=models.CsafMatch.AcceptanceStatus, deflt='1110
     return statusString,status,statusSearch
 
 
+def annotateMatchCounts(queryset):
+    """
+    Restrict a Device, Module or Software queryset to assets with CSAF matches and annotate the
+    match counts per acceptance status.
+    The counts are read from the CsafAssetSummary of each asset, a one-to-one join, so the matches
+    of the assets are not scanned. Only assets with matches have a summary.
+    """
+    return queryset.filter(csaf_summary__isnull=False).annotate(
+        new_count=F('csaf_summary__new_match_count') + F('csaf_summary__reopened_match_count'),
+        confirmed_count=F('csaf_summary__confirmed_match_count'),
+        resolved_count=F('csaf_summary__false_positive_match_count'),
+        total_count=(
+            F('csaf_summary__new_match_count') + F('csaf_summary__reopened_match_count')
+            + F('csaf_summary__confirmed_match_count') + F('csaf_summary__false_positive_match_count')
+        ),
+    )
+
+
 @register_model_view(Device, name='withmatches', path='withmatches', detail=False)
 class DeviceListWithCsafMatches(generic.ObjectListView):
     """ This view handles the request for displaying Devices with CsafMatches as a table. """
-    queryset = Device.objects.annotate(
-            new_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'device': OuterRef('pk')})
-                    .filter(acceptance_status__in=[
-                        models.CsafMatch.AcceptanceStatus.NEW,
-                        models.CsafMatch.AcceptanceStatus.REOPENED])
-                    .values('device')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            confirmed_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'device': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-                    .values('device')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            resolved_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'device': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE)
-                    .values('device')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            total_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'device': OuterRef('pk')})
-                    .values('device')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).filter(total_count__gt=0)
+    queryset = annotateMatchCounts(Device.objects.all())
     table = tables.DevicesWithMatchTable
     filterset = DeviceFilterSet
     filterset_form = DeviceFilterForm
@@ -3136,40 +3346,7 @@ class DeviceListWithCsafMatches(generic.ObjectListView):
 @register_model_view(Module, name='withmatches', path='withmatches', detail=False)
 class ModuleListWithCsafMatches(generic.ObjectListView):
     """ This view handles the request for displaying Modules with CsafMatches as a table. """
-    queryset = Module.objects.annotate(
-            new_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'module': OuterRef('pk')})
-                    .filter(acceptance_status__in=[
-                        models.CsafMatch.AcceptanceStatus.NEW,
-                        models.CsafMatch.AcceptanceStatus.REOPENED])
-                    .values('module')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            confirmed_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'module': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-                    .values('module')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            resolved_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'module': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE)
-                    .values('module')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            total_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'module': OuterRef('pk')})
-                    .values('module')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).filter(total_count__gt=0)
+    queryset = annotateMatchCounts(Module.objects.all())
     table = tables.ModulesWithMatchTable
     filterset = ModuleFilterSet
     filterset_form = ModuleFilterForm
@@ -3178,40 +3355,7 @@ class ModuleListWithCsafMatches(generic.ObjectListView):
 @register_model_view(Software, name='withmatches', path='withmatches', detail=False)
 class SoftwareListWithCsafMatches(generic.ObjectListView):
     """ This view handles the request for displaying Software with CsafMatches as a table. """
-    queryset = Software.objects.annotate(
-            new_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'software': OuterRef('pk')})
-                    .filter(acceptance_status__in=[
-                        models.CsafMatch.AcceptanceStatus.NEW,
-                        models.CsafMatch.AcceptanceStatus.REOPENED])
-                    .values('software')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            confirmed_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'software': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.CONFIRMED)
-                    .values('software')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            resolved_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'software': OuterRef('pk')})
-                    .filter(acceptance_status=models.CsafMatch.AcceptanceStatus.FALSE_POSITIVE)
-                    .values('software')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).annotate(
-            total_count=Subquery(
-                models.CsafMatch.objects
-                    .filter(**{'software': OuterRef('pk')})
-                    .values('software')
-                    .annotate(c=Count('*'))
-                    .values('c'))
-        ).filter(total_count__gt=0)
+    queryset = annotateMatchCounts(Software.objects.all())
     table = tables.SoftwareWithMatchTable
     filterset = SoftwareFilterSet
     filterset_form = SoftwareFilterForm